@@ -0,0 +1,164 @@
+## DeepYellowJ - Version 0.1 (c) 2016 Ahmad Nazeri
+#    AttackMap - attackmap.py
+#
+# This file finds every square each side attacks, in
+# one pass over the pieces. For each side there is a
+# bitboard of the squares attacked by each kind of
+# piece, and one of all the squares it attacks.
+#
+# The evaluator scores mobility, pressure on the
+# Kings and pieces left hanging from these maps (see
+# evaluator.py). The same maps answer if a side is in
+# check, if a square is defended and which piece
+# would take first in an exchange on it, so the search
+# can use them in a node it has evaluated instead of
+# looking at the pieces again.
+
+# Import classes from other files
+from bitboard import WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, FULL, squaresOf
+from attacks import KNIGHT_ATTACKS, KING_ATTACKS, bishopAttacks, rookAttacks
+
+# Every square of the A and H columns
+COLUMN_A = 0x0101010101010101
+COLUMN_H = COLUMN_A << 7
+
+# Finds the squares a side's Pawns attack, all of
+# them at once.
+#
+# Parameters:
+#   pawns   - int (bitboard)
+#   side    - int (WHITE or BLACK)
+# Returns:
+#   attacks - int
+def pawnAttacks(pawns, side):
+    if side == WHITE:
+        return (((pawns << 7) & ~COLUMN_H) | ((pawns << 9) & ~COLUMN_A)) & FULL
+    return ((pawns >> 9) & ~COLUMN_H) | ((pawns >> 7) & ~COLUMN_A)
+
+class AttackMaps:
+    # Constructor for AttackMaps. Finds the attacks of
+    # every piece on the board.
+    #
+    # Parameters:
+    #   board - Board
+    def __init__(self, board):
+        pieces = board.getPieceBitboards()
+        occupied = board.getOccupancy()
+
+        # Copies, the maps are of the position as it is now
+        self._pieces = list(pieces)
+        self._colors = list(board.getColorBitboards())
+        self._pieceAttacks = [[0]*6, [0]*6]
+        self._attacks = [0, 0]
+
+        for side in [WHITE, BLACK]:
+            offset = 6*side
+            pieceAttacks = self._pieceAttacks[side]
+
+            pieceAttacks[PAWN] = pawnAttacks(pieces[offset+PAWN], side)
+
+            for square in squaresOf(pieces[offset+KNIGHT]):
+                pieceAttacks[KNIGHT] |= KNIGHT_ATTACKS[square]
+            for square in squaresOf(pieces[offset+BISHOP]):
+                pieceAttacks[BISHOP] |= bishopAttacks(square, occupied)
+            for square in squaresOf(pieces[offset+ROOK]):
+                pieceAttacks[ROOK] |= rookAttacks(square, occupied)
+            for square in squaresOf(pieces[offset+QUEEN]):
+                pieceAttacks[QUEEN] |= bishopAttacks(square, occupied) | rookAttacks(square, occupied)
+            for square in squaresOf(pieces[offset+KING]):
+                pieceAttacks[KING] |= KING_ATTACKS[square]
+
+            self._attacks[side] = pieceAttacks[PAWN] | pieceAttacks[KNIGHT] | pieceAttacks[BISHOP] | \
+                                  pieceAttacks[ROOK] | pieceAttacks[QUEEN] | pieceAttacks[KING]
+
+    # Gets the squares a side attacks.
+    #
+    # Parameters:
+    #   side    - int (WHITE or BLACK)
+    # Returns:
+    #   attacks - int
+    def getAttacks(self, side):
+        return self._attacks[side]
+
+    # Gets the squares a side attacks with one kind
+    # of piece.
+    #
+    # Parameters:
+    #   side    - int (WHITE or BLACK)
+    #   piece   - int (PAWN ... KING)
+    # Returns:
+    #   attacks - int
+    def getPieceAttacks(self, side, piece):
+        return self._pieceAttacks[side][piece]
+
+    # Gets the squares taken by a side's pieces, when
+    # the maps were found.
+    #
+    # Parameters:
+    #   side     - int (WHITE or BLACK)
+    # Returns:
+    #   occupied - int
+    def getOccupancy(self, side):
+        return self._colors[side]
+
+    # Finds if a square is attacked by a side, like
+    # movegenerator.isSquareAttacked.
+    #
+    # Parameters:
+    #   square   - int
+    #   side     - int (WHITE or BLACK, the side attacking)
+    # Returns:
+    #   attacked - Boolean
+    def isAttacked(self, square, side):
+        return self._attacks[side] & (1 << square) != 0
+
+    # Finds if a side's King is in check, like
+    # movegenerator.isInCheck.
+    #
+    # Parameters:
+    #   side    - int (WHITE or BLACK)
+    # Returns:
+    #   inCheck - Boolean
+    def isInCheck(self, side):
+        return self._pieces[6*side+KING] & self._attacks[1-side] != 0
+
+    # Finds the least valuable kind of piece of a side
+    # that attacks a square, the first piece to take
+    # on it in an exchange (for static exchange
+    # evaluation).
+    #
+    # Parameters:
+    #   square - int
+    #   side   - int (WHITE or BLACK, the side attacking)
+    # Returns:
+    #   piece  - int (PAWN ... KING, None if not attacked)
+    def getLeastValuableAttacker(self, square, side):
+        bit = 1 << square
+        for piece in range(6):
+            if self._pieceAttacks[side][piece] & bit:
+                return piece
+        return None
+
+    # Finds a side's pieces (not the King) that the
+    # other side attacks and it doesn't defend.
+    #
+    # Parameters:
+    #   side    - int (WHITE or BLACK)
+    # Returns:
+    #   hanging - int (bitboard)
+    def getHanging(self, side):
+        pieces = self._colors[side] & ~self._pieces[6*side+KING]
+        return pieces & self._attacks[1-side] & ~self._attacks[side]
+
+    # Finds the squares around a side's King, and the
+    # King's own square.
+    #
+    # Parameters:
+    #   side - int (WHITE or BLACK)
+    # Returns:
+    #   zone - int (bitboard)
+    def getKingZone(self, side):
+        king = self._pieces[6*side+KING]
+        if not king:
+            return 0
+        return king | KING_ATTACKS[king.bit_length()-1]
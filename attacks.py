@@ -0,0 +1,74 @@
+## DeepYellowJ - Version 0.1 (c) 2016 Ahmad Nazeri
+#    Attacks - attacks.py
+#
+# This file holds the attack tables used to
+# generate moves. They are made once, when the
+# file is imported, so finding where a piece
+# can go is a table lookup and a mask instead
+# of stepping square by square. Rooks, Bishops
+# and Queens use the magic bitboard tables
+# from magic.py.
+
+# Import the bitboard helpers
+from bitboard import WHITE, BLACK, FULL
+from magic import loadTables
+
+# Board Size
+SIZE = 8
+
+# Finds the squares reached from a square by
+# each move, one step only.
+#
+# Parameters:
+#   square - int
+#   steps  - [(int, int)]
+# Returns:
+#   attack - int
+def stepAttacks(square, steps):
+    attack = 0
+    row = square//SIZE
+    column = square%SIZE
+
+    for rowMove, columnMove in steps:
+        if 0 <= row+rowMove < SIZE and 0 <= column+columnMove < SIZE:
+            attack |= 1 << ((row+rowMove)*SIZE + column+columnMove)
+
+    return attack
+
+KNIGHT_ATTACKS = [stepAttacks(i, [(1, 2), (1, -2), (-1, 2), (-1, -2), \
+                                  (2, 1), (2, -1), (-2, 1), (-2, -1)]) for i in range(SIZE*SIZE)]
+KING_ATTACKS = [stepAttacks(i, [(1, 0), (0, 1), (1, 1), (1, -1), \
+                                (-1, 0), (0, -1), (-1, 1), (-1, -1)]) for i in range(SIZE*SIZE)]
+
+# Squares a Pawn of each color takes on
+PAWN_ATTACKS = [None, None]
+PAWN_ATTACKS[WHITE] = [stepAttacks(i, [(1, -1), (1, 1)]) for i in range(SIZE*SIZE)]
+PAWN_ATTACKS[BLACK] = [stepAttacks(i, [(-1, -1), (-1, 1)]) for i in range(SIZE*SIZE)]
+
+# Magic bitboard tables for the Rook and Bishop
+# (see magic.py), loaded from the cache if it exists
+MAGIC_TABLES = loadTables()
+ROOK_MASKS, ROOK_MAGICS, ROOK_SHIFTS, ROOK_TABLES = MAGIC_TABLES["rook"]
+BISHOP_MASKS, BISHOP_MAGICS, BISHOP_SHIFTS, BISHOP_TABLES = MAGIC_TABLES["bishop"]
+
+# Finds the squares a Rook attacks.
+#
+# Parameters:
+#   square   - int
+#   occupied - int
+# Returns:
+#   attack   - int
+def rookAttacks(square, occupied):
+    return ROOK_TABLES[square][((occupied & ROOK_MASKS[square]) * ROOK_MAGICS[square] & FULL) \
+                               >> ROOK_SHIFTS[square]]
+
+# Finds the squares a Bishop attacks.
+#
+# Parameters:
+#   square   - int
+#   occupied - int
+# Returns:
+#   attack   - int
+def bishopAttacks(square, occupied):
+    return BISHOP_TABLES[square][((occupied & BISHOP_MASKS[square]) * BISHOP_MAGICS[square] & FULL) \
+                                 >> BISHOP_SHIFTS[square]]
@@ -0,0 +1,391 @@
+## DeepYellowJ - Version 0.1 (c) 2016 Ahmad Nazeri
+#    BatchEvaluator - batchevaluator.py
+#
+# This file scores many positions at once with NumPy,
+# for analysis and for making data. The scores are
+# the same as Evaluator.evaluate gives.
+#
+# Most of what it saves is setting up Boards. Timed on
+# 10,000 positions from random games (one CPU), a
+# position takes about (in us):
+#                                         attackTerms
+#                                         False  True
+#   Board.unpack and Evaluator.evaluate    45     73
+#   Evaluator.evaluate, Board already set   5     23
+#   evaluatePacked                         1.2    2.3
+#   encodeBoards and evaluate              2.2    3.3
+# So it is 30 to 40 times faster than setting up a
+# Board for each packed position, but only about 4
+# times faster than Evaluator.evaluate on Boards that
+# are already set up (about 2 times if the Boards have
+# to be encoded first). The attack terms about double
+# the time here, and take the scalar Evaluator from 5
+# to 23 us. BatchEvaluator(attackTerms=False) leaves
+# them out, the scores are then those of
+# Evaluator(attackTerms=False).
+#
+# A batch of N positions is kept as arrays:
+#   pieces - (N, 12) uint64, the piece bitboards in
+#            bitboard order (color*6 + piece)
+#   sides  - (N,) uint8, the side to move (WHITE or BLACK)
+# A batch can be made from Boards (encodeBoards) or
+# straight from positions packed by Board.pack
+# (decodePacked) without making any Boards.
+#
+# Each bitboard is split into 8 bytes. For every
+# byte of every bitboard there is a table of what the
+# pieces on those 8 squares add up to (material,
+# piece-square tables and game phase), so a position
+# is scored by looking up 96 numbers and adding them.
+# The piece values are added to both piece-square
+# tables, which doesn't change the blended score
+# since the value is the same in both.
+#
+# The middlegame score, endgame score and phase are
+# packed into one 64-bit number, FIELD_BITS bits
+# each, so one look up and one sum give all three.
+#
+# The Pawns are scored like pawnstructure.py does,
+# but for the whole batch at once with shifts of the
+# bitboards instead of a loop over the Pawns. The
+# attack maps (see attackmap.py) are found the same
+# way: every Knight of a side is moved at once, and
+# the sliding pieces are spread along each direction
+# until they reach a piece (a Kogge-Stone fill).
+#
+# Only this file needs NumPy.
+
+# Import classes from other files
+from bitboard import WHITE, BLACK, PAWN
+from bitboard import KNIGHT, BISHOP, ROOK, QUEEN, KING, FULL, PIECE_VALUES
+from evaluator import MOBILITY_WEIGHTS, KING_ZONE_WEIGHTS, HANGING_PENALTY
+from pawnstructure import COLUMN_A, DOUBLED_PENALTY, ISOLATED_PENALTY, PASSED_BONUS
+from piecesquare import MIDDLEGAME, ENDGAME, PHASE, getPhaseMax
+
+# Import what is needed to work on arrays
+import numpy
+
+# Board Size
+SIZE = 8
+
+# Bits for each of the three sums packed together
+FIELD_BITS = 21
+FIELD_MASK = (1 << FIELD_BITS) - 1
+
+# Masks used to count the squares set in a bitboard,
+# adding up pairs of bits, then groups of 4 and 8
+PAIRS = numpy.uint64(0x5555555555555555)
+FOURS = numpy.uint64(0x3333333333333333)
+EIGHTS = numpy.uint64(0x0F0F0F0F0F0F0F0F)
+BYTE_SUMS = numpy.uint64(0x0101010101010101)
+
+# Shifts and masks as uint64, so NumPy keeps the
+# bitboards as uint64
+ROW_SHIFTS = [numpy.uint64(SIZE*row) for row in range(SIZE)]
+ONE = numpy.uint64(1)
+BYTE = numpy.uint64(0xFF)
+COLUMN_A_MASK = numpy.uint64(COLUMN_A)
+COLUMN_H_MASK = numpy.uint64(COLUMN_A << (SIZE-1))
+
+# Steps of the pieces as (shift, mask): a positive
+# shift goes towards H8, and the mask takes off the
+# squares a step can only reach by wrapping around
+# the side of the board
+NOT_A = COLUMN_A_MASK ^ numpy.uint64(FULL)
+NOT_H = COLUMN_H_MASK ^ numpy.uint64(FULL)
+NOT_AB = NOT_A & (NOT_A << ONE)
+NOT_GH = NOT_H & (NOT_H >> ONE)
+ALL = numpy.uint64(FULL)
+ROOK_STEPS = [(8, ALL), (-8, ALL), (1, NOT_A), (-1, NOT_H)]
+BISHOP_STEPS = [(9, NOT_A), (7, NOT_H), (-7, NOT_A), (-9, NOT_H)]
+KNIGHT_STEPS = [(17, NOT_A), (10, NOT_AB), (-6, NOT_AB), (-15, NOT_A), \
+                (15, NOT_H), (6, NOT_GH), (-10, NOT_GH), (-17, NOT_H)]
+
+# Layout of a position packed by Board.pack (see
+# board.PACK_FORMAT)
+PACKED_TYPE = numpy.dtype([("pieces", "<u8", (2*6,)), ("side", "u1"), \
+                           ("castling", "u1"), ("enPassant", "i1")])
+
+# Puts Boards into a batch.
+#
+# Parameters:
+#   boards - [Board]
+# Returns:
+#   (pieces, sides) - (numpy.ndarray, numpy.ndarray)
+def encodeBoards(boards):
+    pieces = numpy.array([board.getPieceBitboards() for board in boards], dtype=numpy.uint64)
+    sides = numpy.array([board.getSideIndex() for board in boards], dtype=numpy.uint8)
+
+    return pieces.reshape(len(boards), 2*6), sides
+
+# Puts positions packed by Board.pack into a batch.
+#
+# Parameters:
+#   packed - [bytes] or bytes (all the positions one after another)
+# Returns:
+#   (pieces, sides) - (numpy.ndarray, numpy.ndarray)
+def decodePacked(packed):
+    if not isinstance(packed, (bytes, bytearray)):
+        packed = b"".join(packed)
+
+    positions = numpy.frombuffer(packed, dtype=PACKED_TYPE)
+    return positions["pieces"], positions["side"]
+
+# Counts the squares set in a batch of bitboards,
+# with shifts and masks only (no table look ups).
+# Each byte ends up holding its own count, and the
+# multiply adds them all into the top byte.
+#
+# Parameters:
+#   bitboards - numpy.ndarray ((N,) uint64)
+# Returns:
+#   counts    - numpy.ndarray ((N,) int64)
+def countSquares(bitboards):
+    counts = bitboards - ((bitboards >> ONE) & PAIRS)
+    counts = (counts & FOURS) + ((counts >> numpy.uint64(2)) & FOURS)
+    counts = (counts + (counts >> numpy.uint64(4))) & EIGHTS
+    return ((counts*BYTE_SUMS) >> numpy.uint64(56)).astype(numpy.int64)
+
+# Scores the doubled and isolated Pawns of one side
+# for a batch (see pawnstructure.pawnPenalty).
+#
+# Parameters:
+#   pawns   - numpy.ndarray ((N,) uint64)
+# Returns:
+#   penalty - numpy.ndarray ((N,) int64)
+def pawnPenalties(pawns):
+    columns = pawns | (pawns >> ROW_SHIFTS[4])
+    columns = columns | (columns >> ROW_SHIFTS[2])
+    columns = (columns | (columns >> ROW_SHIFTS[1])) & BYTE
+    doubled = countSquares(pawns) - countSquares(columns)
+
+    isolatedColumns = columns & ~((columns << ONE) | (columns >> ONE))
+    isolated = countSquares(pawns & (isolatedColumns*COLUMN_A_MASK))
+
+    return DOUBLED_PENALTY*doubled + ISOLATED_PENALTY*isolated
+
+# Finds the squares behind a batch of Pawns, on their
+# columns and the ones beside them (going down the
+# board for White's view, so a White Pawn on them is
+# not passed). Black's Pawns are passed in turned over.
+#
+# Parameters:
+#   pawns   - numpy.ndarray ((N,) uint64)
+#   down    - Boolean (True to go towards row 1)
+# Returns:
+#   squares - numpy.ndarray ((N,) uint64)
+def frontSpans(pawns, down):
+    if down:
+        span = pawns >> ROW_SHIFTS[1]
+        for shift in [ROW_SHIFTS[1], ROW_SHIFTS[2], ROW_SHIFTS[4]]:
+            span = span | (span >> shift)
+    else:
+        span = pawns << ROW_SHIFTS[1]
+        for shift in [ROW_SHIFTS[1], ROW_SHIFTS[2], ROW_SHIFTS[4]]:
+            span = span | (span << shift)
+
+    return span | ((span << ONE) & ~COLUMN_A_MASK) | ((span >> ONE) & ~COLUMN_H_MASK)
+
+# Scores the Pawns of a batch of positions (see
+# pawnstructure.evaluatePawns).
+#
+# Parameters:
+#   whitePawns - numpy.ndarray ((N,) uint64)
+#   blackPawns - numpy.ndarray ((N,) uint64)
+# Returns:
+#   (scores, whitePassed, blackPassed) - (numpy.ndarray, ...) (scores for White)
+def evaluatePawnsBatch(whitePawns, blackPawns):
+    scores = pawnPenalties(blackPawns) - pawnPenalties(whitePawns)
+
+    # A Pawn is passed if it isn't behind an opponent's Pawn
+    whitePassed = whitePawns & ~frontSpans(blackPawns, True)
+    blackPassed = blackPawns & ~frontSpans(whitePawns, False)
+
+    for row in range(1, SIZE-1):
+        scores = scores + PASSED_BONUS[row]*countSquares((whitePassed >> ROW_SHIFTS[row]) & BYTE)
+        scores = scores - PASSED_BONUS[SIZE-1 - row]*countSquares((blackPassed >> ROW_SHIFTS[row]) & BYTE)
+
+    return scores, whitePassed, blackPassed
+
+# Shifts a batch of bitboards towards H8 (or A1 if
+# shift is below 0).
+#
+# Parameters:
+#   bitboards - numpy.ndarray ((N,) uint64)
+#   shift     - int
+# Returns:
+#   shifted   - numpy.ndarray ((N,) uint64)
+def shiftBitboards(bitboards, shift):
+    if shift > 0:
+        return bitboards << numpy.uint64(shift)
+    return bitboards >> numpy.uint64(-shift)
+
+# Finds the squares attacked by pieces that take one
+# step (Knights and Kings), all of them at once.
+#
+# Parameters:
+#   pieces  - numpy.ndarray ((N,) uint64)
+#   steps   - [(int, numpy.uint64)]
+# Returns:
+#   attacks - numpy.ndarray ((N,) uint64)
+def stepAttacksBatch(pieces, steps):
+    attacks = numpy.zeros_like(pieces)
+    for shift, mask in steps:
+        attacks = attacks | (shiftBitboards(pieces, shift) & mask)
+    return attacks
+
+# Finds the squares attacked by sliding pieces, all
+# of them at once, by spreading them along each
+# direction over the empty squares (1, 2 then 4 steps).
+#
+# Parameters:
+#   pieces  - numpy.ndarray ((N,) uint64)
+#   empty   - numpy.ndarray ((N,) uint64)
+#   steps   - [(int, numpy.uint64)]
+# Returns:
+#   attacks - numpy.ndarray ((N,) uint64)
+def slidingAttacksBatch(pieces, empty, steps):
+    attacks = numpy.zeros_like(pieces)
+    for shift, mask in steps:
+        filled = pieces
+        path = empty & mask
+        filled = filled | (path & shiftBitboards(filled, shift))
+        path = path & shiftBitboards(path, shift)
+        filled = filled | (path & shiftBitboards(filled, 2*shift))
+        path = path & shiftBitboards(path, 2*shift)
+        filled = filled | (path & shiftBitboards(filled, 4*shift))
+        attacks = attacks | (shiftBitboards(filled, shift) & mask)
+    return attacks
+
+# Scores mobility, pressure on the Kings and hanging
+# pieces for a batch (see Evaluator.evaluateAttacks).
+#
+# Parameters:
+#   pieces - numpy.ndarray ((N, 12) uint64)
+# Returns:
+#   scores - numpy.ndarray ((N,) int64, scores for White)
+def evaluateAttacksBatch(pieces):
+    occupied = numpy.bitwise_or.reduce(pieces, axis=1)
+    empty = ~occupied
+
+    # The attack maps of each side, by kind of piece
+    pieceAttacks = [[None]*6, [None]*6]
+    attacks = [None, None]
+    occupancy = [None, None]
+    for side in [WHITE, BLACK]:
+        offset = 6*side
+        pawns = pieces[:, offset+PAWN]
+        queens = pieces[:, offset+QUEEN]
+        sideAttacks = pieceAttacks[side]
+
+        if side == WHITE:
+            sideAttacks[PAWN] = ((pawns << ROW_SHIFTS[1] << ONE) & NOT_A) | \
+                                ((pawns << ROW_SHIFTS[1] >> ONE) & NOT_H)
+        else:
+            sideAttacks[PAWN] = ((pawns >> ROW_SHIFTS[1] << ONE) & NOT_A) | \
+                                ((pawns >> ROW_SHIFTS[1] >> ONE) & NOT_H)
+        sideAttacks[KNIGHT] = stepAttacksBatch(pieces[:, offset+KNIGHT], KNIGHT_STEPS)
+        sideAttacks[BISHOP] = slidingAttacksBatch(pieces[:, offset+BISHOP], empty, BISHOP_STEPS)
+        sideAttacks[ROOK] = slidingAttacksBatch(pieces[:, offset+ROOK], empty, ROOK_STEPS)
+        sideAttacks[QUEEN] = slidingAttacksBatch(queens, empty, BISHOP_STEPS) | \
+                             slidingAttacksBatch(queens, empty, ROOK_STEPS)
+        sideAttacks[KING] = stepAttacksBatch(pieces[:, offset+KING], ROOK_STEPS + BISHOP_STEPS)
+
+        attacks[side] = numpy.bitwise_or.reduce(sideAttacks)
+        occupancy[side] = numpy.bitwise_or.reduce(pieces[:, offset:offset+6], axis=1)
+
+    scores = numpy.zeros(len(pieces), dtype=numpy.int64)
+    for side, sign in [(WHITE, 1), (BLACK, -1)]:
+        opponent = 1 - side
+        king = pieces[:, 6*opponent+KING]
+        area = ~occupancy[side] & ~pieceAttacks[opponent][PAWN]
+        kingZone = king | pieceAttacks[opponent][KING]
+
+        hanging = occupancy[side] & ~pieces[:, 6*side+KING] & attacks[opponent] & ~attacks[side]
+        sideScores = -HANGING_PENALTY*countSquares(hanging)
+
+        for piece in range(KNIGHT, KING):
+            sideScores = sideScores + \
+                         MOBILITY_WEIGHTS[piece]*countSquares(pieceAttacks[side][piece] & area) + \
+                         KING_ZONE_WEIGHTS[piece]*countSquares(pieceAttacks[side][piece] & kingZone)
+
+        scores = scores + sign*sideScores
+
+    return scores
+
+class BatchEvaluator:
+    # Constructor for BatchEvaluator. The tables are
+    # copied, so after piecesquare.loadTables a new
+    # BatchEvaluator is needed.
+    #
+    # Parameters:
+    #   attackTerms - Boolean (=True, like Evaluator's)
+    def __init__(self, attackTerms=True):
+        self._attackTerms = attackTerms
+        self._phaseMax = getPhaseMax()
+
+        # What one piece adds on each square, packed
+        weights = numpy.zeros((2*6, SIZE*SIZE), dtype=numpy.int64)
+        for piece in range(2*6):
+            if piece < 6:
+                value = PIECE_VALUES[piece]
+            else:
+                value = -PIECE_VALUES[piece-6]
+
+            # A position has at most 64 pieces, the sums
+            # have to fit in their bits
+            largest = max(abs(score + value) for score in MIDDLEGAME[piece] + ENDGAME[piece])
+            if 64*largest >= 1 << (FIELD_BITS-1) or PHASE[piece] < 0 or \
+               64*PHASE[piece] > FIELD_MASK:
+                raise ValueError("Piece-square tables too large for BatchEvaluator")
+
+            weights[piece] = (numpy.array(MIDDLEGAME[piece]) + value << 2*FIELD_BITS) + \
+                             (numpy.array(ENDGAME[piece]) + value << FIELD_BITS) + PHASE[piece]
+
+        # The sum for every value of every byte
+        bits = (numpy.arange(256)[:, None] >> numpy.arange(SIZE)) & 1
+        weights = weights.reshape(2*6*SIZE, SIZE)
+        self._table = (bits @ weights.T).T.ravel()
+        self._offsets = numpy.arange(0, 2*6*SIZE*256, 256)
+
+    # Scores a batch of positions.
+    #
+    # Parameters:
+    #   pieces - numpy.ndarray ((N, 12) uint64)
+    #   sides  - numpy.ndarray ((N,) uint8)
+    # Returns:
+    #   scores - numpy.ndarray ((N,) int64, centipawns for the side to move)
+    def evaluate(self, pieces, sides):
+        count = len(pieces)
+        pieces = numpy.ascontiguousarray(pieces, dtype="<u8")
+
+        # Byte i of each bitboard is squares 8i to 8i+7
+        positionBytes = pieces.view(numpy.uint8).reshape(count, 2*6*SIZE)
+        totals = numpy.take(self._table, positionBytes + self._offsets).sum(axis=1)
+
+        # The phase is never below 0, so it is the low bits,
+        # then the endgame score, which can be below 0
+        phase = totals & FIELD_MASK
+        totals = totals >> FIELD_BITS
+        endgame = ((totals + (1 << (FIELD_BITS-1))) & FIELD_MASK) - (1 << (FIELD_BITS-1))
+        middlegame = (totals - endgame) >> FIELD_BITS
+
+        phaseMax = self._phaseMax
+        phase = numpy.minimum(phase, phaseMax)
+        scores = (middlegame*phase + endgame*(phaseMax - phase))//phaseMax
+        scores = scores + evaluatePawnsBatch(pieces[:, 6*WHITE + PAWN], pieces[:, 6*BLACK + PAWN])[0]
+
+        if self._attackTerms:
+            scores = scores + evaluateAttacksBatch(pieces)
+
+        return numpy.where(numpy.asarray(sides) == BLACK, -scores, scores)
+
+    # Scores positions packed by Board.pack.
+    #
+    # Parameters:
+    #   packed - [bytes] or bytes
+    # Returns:
+    #   scores - numpy.ndarray ((N,) int64)
+    def evaluatePacked(self, packed):
+        pieces, sides = decodePacked(packed)
+        return self.evaluate(pieces, sides)
@@ -0,0 +1,95 @@
+## DeepYellowJ - Version 0.1 (c) 2016 Ahmad Nazeri
+#    Bitboard - bitboard.py
+#
+# This file holds the constants and helper
+# functions used by the bitboards. A bitboard
+# is a 64-bit integer with one bit per square:
+# A1 is bit 0, B1 is bit 1, ..., H8 is bit 63.
+
+# Colors, in the order used to index the masks
+WHITE = 0
+BLACK = 1
+COLORS = ["w", "b"]
+
+# Piece types, in the order used to index the bitboards
+PAWN = 0
+KNIGHT = 1
+BISHOP = 2
+ROOK = 3
+QUEEN = 4
+KING = 5
+PIECE_NAMES = ["P", "N", "B", "R", "Q", "K"]
+
+# Centipawn value of each kind of piece, in bitboard
+# order. Both sides always have a King, so it counts 0.
+PIECE_VALUES = [100, 320, 330, 500, 900, 0]
+
+# Every square set
+FULL = 0xFFFFFFFFFFFFFFFF
+
+# Used to count the squares set in a bitboard.
+# int.bit_count only exists in newer Pythons.
+try:
+    popCount = int.bit_count
+except AttributeError:
+    def popCount(bitboard):
+        return bin(bitboard).count("1")
+
+# Finds the index (0-11) of the bitboard that holds
+# a given kind of piece. White pieces are 0-5 and
+# black pieces are 6-11.
+#
+# Parameters:
+#   name  - String
+#   color - String
+# Returns:
+#   index - int
+def pieceIndex(name, color):
+    return 6*COLORS.index(color) + PIECE_NAMES.index(name)
+
+# Goes through every square set in a bitboard,
+# from A1 up to H8.
+#
+# Parameters:
+#   bitboard - int
+# Returns:
+#   square   - int (generator)
+def squaresOf(bitboard):
+    while bitboard:
+        lowest = bitboard & -bitboard
+        yield lowest.bit_length() - 1
+        bitboard ^= lowest
+
+# Finds the largest power of two entries of a table
+# that fit in a number of bytes (at least one), so an
+# entry can be found with a mask of the hash.
+#
+# Parameters:
+#   sizeBytes  - int
+#   entryBytes - int
+# Returns:
+#   entries    - int
+def tableEntries(sizeBytes, entryBytes):
+    entries = 1
+    while 2*entries*entryBytes <= sizeBytes:
+        entries = 2*entries
+    return entries
+
+# Castling rights, kept together as one int
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+ALL_CASTLING = 15
+
+# Castling rights kept when a piece moves from or
+# to each square. Moving a King or Rook off its
+# starting square (or taking a Rook there) loses
+# the matching rights.
+CASTLING_KEPT = [ALL_CASTLING for i in range(64)]
+CASTLING_KEPT[0] = ALL_CASTLING & ~WHITE_QUEENSIDE
+CASTLING_KEPT[4] = ALL_CASTLING & ~(WHITE_KINGSIDE | WHITE_QUEENSIDE)
+CASTLING_KEPT[7] = ALL_CASTLING & ~WHITE_KINGSIDE
+CASTLING_KEPT[56] = ALL_CASTLING & ~BLACK_QUEENSIDE
+CASTLING_KEPT[60] = ALL_CASTLING & ~(BLACK_KINGSIDE | BLACK_QUEENSIDE)
+CASTLING_KEPT[63] = ALL_CASTLING & ~BLACK_KINGSIDE
@@ -5,9 +5,23 @@
 # and displays the board and moves
 # pieces.
 
-# Import classes from other files
-from ezgraphics import *
-from piece import Piece
+# Import classes from other files. ezgraphics opens a
+# window as soon as it is imported, so it is only
+# imported by the methods that draw (perft.py and the
+# search never draw).
+from piece import PIECES
+from bitboard import COLORS, PIECE_NAMES, PIECE_VALUES, WHITE, BLACK, PAWN, ROOK, KING, \
+                     ALL_CASTLING, CASTLING_KEPT, WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, \
+                     BLACK_QUEENSIDE, pieceIndex, squaresOf
+from squares import SQUARE_NAMES, SQUARE_INDEX, ROWS_AND_COLUMNS
+from attacks import PAWN_ATTACKS
+from zobrist import PIECE_KEYS, SIDE_KEY, CASTLING_KEYS, EN_PASSANT_KEYS
+from piecesquare import MIDDLEGAME, ENDGAME, PHASE
+from movegenerator import CASTLE, EN_PASSANT, PROMOTE_KNIGHT, legalMoves, pseudoLegalMoves, \
+                          isInCheck, makeMoveCode, moveCurrent, moveNew
+
+# Import struct to pack positions
+import struct
 
 # Constants used graphics
 SIZE = 8
@@ -15,60 +29,105 @@ SQUARESIZE = 70
 COLOR1 = "red"
 COLOR2 = "white"
 
+# Starting position and castling letters used by FEN,
+# with the squares the King and Rook must be on
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+FEN_CASTLING = [("K", WHITE_KINGSIDE, 4, 7), ("Q", WHITE_QUEENSIDE, 4, 0), \
+                ("k", BLACK_KINGSIDE, 60, 63), ("q", BLACK_QUEENSIDE, 60, 56)]
+
+# A packed position: the 12 piece bitboards, the side
+# to move, the castling rights and the en passant
+# square (-1 for none), 99 bytes in all
+PACK_FORMAT = "<12QBBb"
+
 class Board:
     # Constructor of Board
+    #
+    # The position is kept as one bitboard per kind of
+    # piece (see bitboard.py) plus an occupancy mask for
+    # each color. self._squares holds the index of the
+    # piece on each square (see piece.PIECES) so getPiece
+    # doesn't have to search the bitboards. self._hash
+    # is the Zobrist hash of the position (see
+    # zobrist.py), kept up to date as pieces are moved.
+    # self._counts has the number of each kind of piece
+    # and self._material the material score for White
+    # (see bitboard.PIECE_VALUES), also kept up to date,
+    # so the pieces never have to be counted. In the same
+    # way self._middlegame and self._endgame are the sums
+    # of the piece-square tables for White, and self._phase
+    # the game phase (see piecesquare.py). self._pawnHash
+    # is the Zobrist hash of the Pawns only, used to find
+    # the Pawn score (see pawnstructure.py).
     def __init__(self):
-        self._board = [[None for i in range(SIZE)]for j in range(SIZE)]
+        self.clear()
         self._window = False
         self._canvas = False
 
+    # Takes every piece off the board and resets
+    # whose move it is, the castling rights and the
+    # en passant square.
+    def clear(self):
+        self._pieces = [0 for i in range(2*6)]
+        self._colors = [0, 0]
+        self._occupied = 0
+        self._squares = [None for i in range(SIZE*SIZE)]
+        self._sideToMove = WHITE
+        self._castling = 0
+        self._enPassant = None
+        self._hash = 0
+        self._counts = [0 for i in range(2*6)]
+        self._material = 0
+        self._middlegame = 0
+        self._endgame = 0
+        self._phase = 0
+        self._pawnHash = 0
+
     # Moves piece from one position (current)
     # to another position (new).
     #
     # Parameters:
     #   current    - String
     #   new        - String
+    #   promotion  - String (=None, piece a Pawn promotes to, "Q" if None)
     # Returns:
     #   pieceTaken - Piece
-    def move(self, current, new):
+    def move(self, current, new, promotion=None):
+        from ezgraphics import GraphicsImage
+
         # Used to draw square and piece
         canvas = self._canvas
-        # Gets the row and column for current and new
-        # to be used to move piece
-        currentRow, currentColumn = self.findRowAndColumn(current)
-        newRow, newColumn = self.findRowAndColumn(new)
-
-        # Moves the pieces
-        piece = self._board[currentColumn][currentRow]
-        piece.changedMoved() # Identifies that piece has been moved
-        pieceTaken = self._board[newColumn][newRow]
-        self._board[newColumn][newRow] = piece
-        # Makes the current spot empty (None)
-        self._board[currentColumn][currentRow] = None
-
-        # Determines the color of current square
-        if (currentColumn+currentRow)%2 == 0:
-            currentColor = COLOR1
-        else:
-            currentColor = COLOR2
 
-        # Determines the color of new square
-        if (newColumn+newRow)%2 == 0:
-            newColor = COLOR1
-        else:
-            newColor = COLOR2
+        # Moves the pieces, keeping the old squares to
+        # find which ones changed (castling and en passant
+        # change more than two)
+        before = list(self._squares)
+        pieceTaken = self.move2(current, new, promotion)
+
+        for square in range(SIZE*SIZE):
+            if self._squares[square] == before[square]:
+                continue
+
+            row, column = ROWS_AND_COLUMNS[square]
+
+            # Determines the color of the square
+            if (column+row)%2 == 0:
+                color = COLOR1
+            else:
+                color = COLOR2
 
-        # Redraw the squares
-        self.drawSquare(SQUARESIZE*(currentColumn+1), SQUARESIZE*(currentRow+1), currentColor)
-        self.drawSquare(SQUARESIZE*(newColumn+1), SQUARESIZE*(newRow+1), newColor)
+            # Redraw the square
+            self.drawSquare(SQUARESIZE*(column+1), SQUARESIZE*(row+1), color)
 
-        # Gets name of the piece and corresponding image
-        piece = piece.getColor()+piece.getName()
-        piecePic = GraphicsImage("pieces/"+piece+".png")
+            if self._squares[square] != None:
+                # Gets name of the piece and corresponding image
+                piece = PIECES[self._squares[square]]
+                piece = piece.getColor()+piece.getName()
+                piecePic = GraphicsImage("pieces/"+piece+".png")
 
-        # Draws the piece            
-        canvas.drawImage(3/2*SQUARESIZE+(newColumn)*SQUARESIZE-32, \
-                         (newRow+1)*SQUARESIZE+5, piecePic)
+                # Draws the piece            
+                canvas.drawImage(3/2*SQUARESIZE+(column)*SQUARESIZE-32, \
+                                 (row+1)*SQUARESIZE+5, piecePic)
 
         return pieceTaken
 
@@ -81,20 +140,265 @@ class Board:
     # Parameters:
     #   current    - String
     #   new        - String
+    #   promotion  - String (=None, piece a Pawn promotes to, "Q" if None)
     # Returns:
     #   pieceTaken - Piece
-    def move2(self, current, new):
-        currentRow, currentColumn = self.findRowAndColumn(current)
-        newRow, newColumn = self.findRowAndColumn(new)
+    def move2(self, current, new, promotion=None):
+        move = self.findMoveCode(SQUARE_INDEX[current], SQUARE_INDEX[new], promotion)
+        pieceTaken = self.makeMove(move)[1]
+
+        if pieceTaken == None:
+            return None
+        return PIECES[pieceTaken]
+
+    # Finds the legal move from one square to another,
+    # with its castling/en passant/promotion flags. Pawns
+    # promote to the piece given, or a Queen. If there is
+    # no such legal move, a plain move is returned.
+    #
+    # Parameters:
+    #   current   - int
+    #   new       - int
+    #   promotion - String (=None, "N", "B", "R" or "Q")
+    # Returns:
+    #   move      - int
+    def findMoveCode(self, current, new, promotion=None):
+        if promotion == None:
+            promotion = "Q"
+
+        for move in legalMoves(self):
+            if moveCurrent(move) != current or moveNew(move) != new:
+                continue
+            if move >> 12 >= PROMOTE_KNIGHT and PIECE_NAMES[(move >> 12) - 3] != promotion.upper():
+                continue
+            return move
+
+        return makeMoveCode(current, new)
+
+    # Makes a move (see movegenerator.py) without
+    # drawing it and returns what is needed to take
+    # it back. The undo record is a tuple:
+    #   (move, pieceTaken, castling, enPassant, hash)
+    # where pieceTaken is the index of the piece taken
+    # (or None), and castling/enPassant/hash are the
+    # rights, square and hash from before the move.
+    #
+    # Parameters:
+    #   move - int
+    # Returns:
+    #   undo - ()
+    def makeMove(self, move):
+        current = move & 63
+        new = (move >> 6) & 63
+        flags = move >> 12
+        piece = self._squares[current]
+        side = self._sideToMove
+
+        # The hash is kept before any piece is taken off
+        positionHash = self._hash
+
+        if flags == EN_PASSANT:
+            # The Pawn taken is beside the one moving
+            pieceTaken = self.removePiece(new - SIZE + 2*SIZE*side)
+        else:
+            pieceTaken = self._squares[new]
+
+        undo = (move, pieceTaken, self._castling, self._enPassant, positionHash)
+
+        self.movePiece(current, new)
+
+        if flags == CASTLE:
+            # The Rook moves to the other side of the King
+            if new > current:
+                self.movePiece(new+1, new-1)
+            else:
+                self.movePiece(new-2, new+1)
+        elif flags >= PROMOTE_KNIGHT:
+            self.removePiece(new)
+            self.addPiece(6*side + flags-3, new)
+
+        # Moving a King or Rook loses its castling rights
+        self._hash ^= CASTLING_KEYS[self._castling]
+        self._castling &= CASTLING_KEPT[current] & CASTLING_KEPT[new]
+        self._hash ^= CASTLING_KEYS[self._castling]
+
+        if self._enPassant != None:
+            self._hash ^= EN_PASSANT_KEYS[self._enPassant%SIZE]
+        self._enPassant = None
+
+        # A Pawn moving two spaces can be taken en passant, the
+        # square is only kept if an opponent's Pawn can take it
+        if piece%6 == PAWN and abs(new-current) == 2*SIZE:
+            square = (current+new)//2
+            opponentPawns = self._pieces[6*(1 - side) + PAWN]
+            if PAWN_ATTACKS[side][square] & opponentPawns:
+                self._enPassant = square
+                self._hash ^= EN_PASSANT_KEYS[square%SIZE]
+
+        self._sideToMove = 1 - side
+        self._hash ^= SIDE_KEY
+
+        return undo
+
+    # Takes back a move made by makeMove, putting
+    # the board back exactly as it was before.
+    #
+    # Parameters:
+    #   undo - ()
+    def unmakeMove(self, undo):
+        move, pieceTaken, castling, enPassant, positionHash = undo
+        current = move & 63
+        new = (move >> 6) & 63
+        flags = move >> 12
+
+        self._sideToMove = 1 - self._sideToMove
+
+        if flags >= PROMOTE_KNIGHT:
+            self.removePiece(new)
+            self.addPiece(6*self._sideToMove + PAWN, new)
+        elif flags == CASTLE:
+            if new > current:
+                self.addPiece(self.removePiece(new-1), new+1)
+            else:
+                self.addPiece(self.removePiece(new+1), new-2)
+
+        self.addPiece(self.removePiece(new), current)
+
+        if pieceTaken != None:
+            if flags == EN_PASSANT:
+                self.addPiece(pieceTaken, new - SIZE + 2*SIZE*self._sideToMove)
+            else:
+                self.addPiece(pieceTaken, new)
+
+        self._castling = castling
+        self._enPassant = enPassant
+        self._hash = positionHash
+
+    # Passes the move to the other side (a null move),
+    # used by the search. Returns what is needed to take
+    # it back: (enPassant, hash) from before.
+    #
+    # Returns:
+    #   undo - ()
+    def makeNullMove(self):
+        undo = (self._enPassant, self._hash)
+
+        if self._enPassant != None:
+            self._hash ^= EN_PASSANT_KEYS[self._enPassant%SIZE]
+        self._enPassant = None
+
+        self._sideToMove = 1 - self._sideToMove
+        self._hash ^= SIDE_KEY
+
+        return undo
+
+    # Takes back a null move made by makeNullMove.
+    #
+    # Parameters:
+    #   undo - ()
+    def unmakeNullMove(self, undo):
+        self._sideToMove = 1 - self._sideToMove
+        self._enPassant, self._hash = undo
+
+    # Goes through the moves of the side to move
+    # that follow how the pieces move, without checking
+    # if the King is left in check (see movegenerator.py).
+    #
+    # Returns:
+    #   move - int (generator)
+    def generatePseudoLegalMoves(self):
+        return pseudoLegalMoves(self)
 
-        piece = self._board[currentColumn][currentRow]
-        piece.changedMoved()
-        pieceTaken = self._board[newColumn][newRow]
-        self._board[newColumn][newRow] = piece
-        self._board[currentColumn][currentRow] = None
+    # Goes through the legal moves of the side to move
+    # (see movegenerator.py).
+    #
+    # Returns:
+    #   move - int (generator)
+    def generateLegalMoves(self):
+        return legalMoves(self)
+
+    # Finds if the side to move is in check.
+    #
+    # Returns:
+    #   inCheck - Boolean
+    def isInCheck(self):
+        return isInCheck(self, self._sideToMove)
+
+    # Moves the piece on one square to another
+    # square and updates the bitboards.
+    #
+    # Parameters:
+    #   current    - int
+    #   new        - int
+    # Returns:
+    #   pieceTaken - int
+    def movePiece(self, current, new):
+        pieceTaken = self._squares[new]
+
+        if pieceTaken != None:
+            self.removePiece(new)
+        self.addPiece(self.removePiece(current), new)
 
         return pieceTaken
 
+    # Puts a piece on a square and sets its
+    # bit in the bitboards.
+    #
+    # Parameters:
+    #   piece  - int
+    #   square - int
+    def addPiece(self, piece, square):
+        bit = 1 << square
+
+        self._pieces[piece] |= bit
+        self._colors[piece//6] |= bit
+        self._occupied |= bit
+        self._squares[square] = piece
+        self._hash ^= PIECE_KEYS[piece][square]
+        self._counts[piece] = self._counts[piece] + 1
+        self._middlegame = self._middlegame + MIDDLEGAME[piece][square]
+        self._endgame = self._endgame + ENDGAME[piece][square]
+        self._phase = self._phase + PHASE[piece]
+
+        if piece%6 == PAWN:
+            self._pawnHash ^= PIECE_KEYS[piece][square]
+
+        if piece < 6:
+            self._material = self._material + PIECE_VALUES[piece]
+        else:
+            self._material = self._material - PIECE_VALUES[piece-6]
+
+    # Takes the piece off a square and clears
+    # its bit in the bitboards.
+    #
+    # Parameters:
+    #   square - int
+    # Returns:
+    #   piece  - int
+    def removePiece(self, square):
+        piece = self._squares[square]
+        bit = 1 << square
+
+        self._pieces[piece] &= ~bit
+        self._colors[piece//6] &= ~bit
+        self._occupied &= ~bit
+        self._squares[square] = None
+        self._hash ^= PIECE_KEYS[piece][square]
+        self._counts[piece] = self._counts[piece] - 1
+        self._middlegame = self._middlegame - MIDDLEGAME[piece][square]
+        self._endgame = self._endgame - ENDGAME[piece][square]
+        self._phase = self._phase - PHASE[piece]
+
+        if piece%6 == PAWN:
+            self._pawnHash ^= PIECE_KEYS[piece][square]
+
+        if piece < 6:
+            self._material = self._material - PIECE_VALUES[piece]
+        else:
+            self._material = self._material + PIECE_VALUES[piece-6]
+
+        return piece
+
     # Puts a piece in a position.
     #
     # Parameters:
@@ -102,8 +406,12 @@ class Board:
     #   color     - String
     #   position  - String
     def putPiece(self, pieceName, color, position):
-        row, column = self.findRowAndColumn(position)
-        self._board[column][row] = Piece(pieceName, color, 5)
+        square = SQUARE_INDEX[position]
+
+        # Replaces the piece already there
+        if self._squares[square] != None:
+            self.removePiece(square)
+        self.addPiece(pieceIndex(pieceName, color), square)
     
     # Gets the piece at a given position.
     #
@@ -112,68 +420,381 @@ class Board:
     # Returns:
     #   piece    - Piece
     def getPiece(self, position):
-        row, column = self.findRowAndColumn(position)
-        piece = self._board[column][row]
-        return piece
+        return self.getPieceAt(SQUARE_INDEX[position])
+
+    # Gets the piece on a given square.
+    #
+    # Parameters:
+    #   square - int
+    # Returns:
+    #   piece  - Piece
+    def getPieceAt(self, square):
+        piece = self._squares[square]
+
+        if piece == None:
+            return None
+        return PIECES[piece]
+
+    # Gets the color whose move it is.
+    #
+    # Returns:
+    #   color - String
+    def getSideToMove(self):
+        return COLORS[self._sideToMove]
+
+    # Gets whose move it is as WHITE or BLACK
+    # (see bitboard.py).
+    #
+    # Returns:
+    #   side - int
+    def getSideIndex(self):
+        return self._sideToMove
+
+    # Gets the castling rights that are left
+    # (see bitboard.py).
+    #
+    # Returns:
+    #   castling - int
+    def getCastlingRights(self):
+        return self._castling
+
+    # Gets the square a Pawn can take en passant,
+    # None if there isn't one.
+    #
+    # Returns:
+    #   square - int
+    def getEnPassant(self):
+        return self._enPassant
+
+    # Gets the Zobrist hash of the position.
+    #
+    # Returns:
+    #   hash - int
+    def getHash(self):
+        return self._hash
+
+    # Gets the number of each kind of piece on the
+    # board, indexed like the bitboards (color*6 + piece).
+    # The list must not be changed.
+    #
+    # Returns:
+    #   counts - [int]
+    def getPieceCounts(self):
+        return self._counts
+
+    # Gets the material score in centipawns for White
+    # (see bitboard.PIECE_VALUES).
+    #
+    # Returns:
+    #   material - int
+    def getMaterial(self):
+        return self._material
+
+    # Gets the sums of the middlegame and endgame
+    # piece-square tables for White (see piecesquare.py).
+    #
+    # Returns:
+    #   (middlegame, endgame) - (int, int)
+    def getPieceSquareScores(self):
+        return self._middlegame, self._endgame
+
+    # Gets the game phase, from the pieces left (see
+    # piecesquare.py). It goes down as pieces are taken.
+    #
+    # Returns:
+    #   phase - int
+    def getPhase(self):
+        return self._phase
+
+    # Gets the Zobrist hash of the Pawns only (the
+    # keys of the Pawns on their squares).
+    #
+    # Returns:
+    #   pawnHash - int
+    def getPawnHash(self):
+        return self._pawnHash
+
+    # Finds the Zobrist hash of the position from
+    # scratch. Used after the side to move, castling
+    # rights or en passant square are set directly.
+    #
+    # Returns:
+    #   positionHash - int
+    def computeHash(self):
+        positionHash = 0
+
+        for square in squaresOf(self._occupied):
+            positionHash ^= PIECE_KEYS[self._squares[square]][square]
+
+        if self._sideToMove == BLACK:
+            positionHash ^= SIDE_KEY
+        positionHash ^= CASTLING_KEYS[self._castling]
+        if self._enPassant != None:
+            positionHash ^= EN_PASSANT_KEYS[self._enPassant%SIZE]
+
+        return positionHash
+
+    # Finds if everything the board keeps up to date
+    # as pieces move (the hashes, piece counts, material,
+    # piece-square sums and phase) matches the pieces on
+    # it, by working it all out again from scratch.
+    #
+    # Returns:
+    #   consistent - Boolean
+    def isConsistent(self):
+        counts = [0 for i in range(2*6)]
+        material = 0
+        middlegame = 0
+        endgame = 0
+        phase = 0
+        pawnHash = 0
+
+        for square in squaresOf(self._occupied):
+            piece = self._squares[square]
+            counts[piece] = counts[piece] + 1
+            middlegame = middlegame + MIDDLEGAME[piece][square]
+            endgame = endgame + ENDGAME[piece][square]
+            phase = phase + PHASE[piece]
+
+            if piece < 6:
+                material = material + PIECE_VALUES[piece]
+            else:
+                material = material - PIECE_VALUES[piece-6]
+            if piece%6 == PAWN:
+                pawnHash ^= PIECE_KEYS[piece][square]
+
+        return self._hash == self.computeHash() and self._pawnHash == pawnHash and \
+               self._counts == counts and self._material == material and \
+               self._middlegame == middlegame and self._endgame == endgame and self._phase == phase
+
+    # Gets the bitboards of every kind of piece, in
+    # the order of bitboard.pieceIndex. The list
+    # must not be changed.
+    #
+    # Returns:
+    #   bitboards - [int]
+    def getPieceBitboards(self):
+        return self._pieces
+
+    # Gets the index of the piece on each square (None
+    # for an empty square), see bitboard.pieceIndex. The
+    # list must not be changed.
+    #
+    # Returns:
+    #   squares - [int]
+    def getSquares(self):
+        return self._squares
+
+    # Gets the occupancy masks of both colors, indexed
+    # by WHITE and BLACK. The list must not be changed.
+    #
+    # Returns:
+    #   bitboards - [int]
+    def getColorBitboards(self):
+        return self._colors
+
+    # Gets the mask of the squares occupied by
+    # one color, or by both if color is None.
+    #
+    # Parameters:
+    #   color    - String (=None)
+    # Returns:
+    #   bitboard - int
+    def getOccupancy(self, color=None):
+        if color == None:
+            return self._occupied
+        return self._colors[COLORS.index(color)]
 
     # Sets the board in the starting position.
     # And makes calls to draw board and pieces  
     def initialize(self):
+        from ezgraphics import GraphicsWindow
+
         # Creates the Graphics Window & canvas
         self._window = GraphicsWindow((SIZE-1)*100, (SIZE-1)*100)
         self._canvas = self._window.canvas()
 
+        self.setupPieces()
+
+        # Make calls to draw board and pieces
+        self.drawBoard()
+        self.drawPieces()
+
+    # Puts the pieces in the starting position
+    # without drawing anything. Anything already on
+    # the board is taken off first.
+    def setupPieces(self):
+        self.clear()
+
         # Used to initialize the pieces
         color = ["b", "w"]
         piece = ["K", "Q", "R", "N", "B", "P"]
 
-        # Create the pieces for black
-        self._board[0][0] = Piece(piece[2], color[0], 5)
-        self._board[1][0] = Piece(piece[3], color[0], 3)
-        self._board[2][0] = Piece(piece[4], color[0], 3)
-        self._board[3][0] = Piece(piece[1], color[0], 9)
-        self._board[4][0] = Piece(piece[0], color[0], 100)
-        self._board[5][0] = Piece(piece[4], color[0], 3)
-        self._board[6][0] = Piece(piece[3], color[0], 3)
-        self._board[7][0] = Piece(piece[2], color[0], 5)
-
-        # Create the black pawns
-        for i in range(SIZE):
-            self._board[i][1] = Piece(piece[5], color[0], 1)
-
-        # Create the pieces for white
-        self._board[0][7] = Piece(piece[2], color[1], 5)
-        self._board[1][7] = Piece(piece[3], color[1], 3)
-        self._board[2][7] = Piece(piece[4], color[1], 3)
-        self._board[3][7] = Piece(piece[1], color[1], 9)
-        self._board[4][7] = Piece(piece[0], color[1], 100)
-        self._board[5][7] = Piece(piece[4], color[1], 3)
-        self._board[6][7] = Piece(piece[3], color[1], 3)
-        self._board[7][7] = Piece(piece[2], color[1], 5)
-
-        # Create the white pawns
+        # Order of the pieces on the back rows
+        backRow = [piece[2], piece[3], piece[4], piece[1], \
+                   piece[0], piece[4], piece[3], piece[2]]
+
         for i in range(SIZE):
-            self._board[i][6] = Piece(piece[5], color[1], 1)
+            # Create the pieces for black
+            self.addPiece(pieceIndex(backRow[i], color[0]), 7*SIZE+i)
+            # Create the black pawns
+            self.addPiece(pieceIndex(piece[5], color[0]), 6*SIZE+i)
+
+            # Create the pieces for white
+            self.addPiece(pieceIndex(backRow[i], color[1]), i)
+            # Create the white pawns
+            self.addPiece(pieceIndex(piece[5], color[1]), SIZE+i)
+
+        self._sideToMove = WHITE
+        self._castling = ALL_CASTLING
+        self._enPassant = None
+        self._hash = self.computeHash()
+
+        assert self.isConsistent(), "Board counters don't match the pieces"
+
+    # Sets up the position given by a FEN string, for
+    # example START_FEN, without drawing anything. The
+    # move counters at the end may be left out.
+    #
+    # Parameters:
+    #   fen - String
+    def loadFen(self, fen):
+        fields = fen.split()
+        if len(fields) < 4:
+            raise ValueError("FEN needs at least 4 fields: " + fen)
+
+        rows = fields[0].split("/")
+        if len(rows) != SIZE:
+            raise ValueError("FEN needs 8 rows: " + fen)
+
+        self.clear()
+
+        # The rows go from the 8th row down to the 1st
+        for row in range(SIZE):
+            column = 0
+            for letter in rows[row]:
+                if letter.isdigit():
+                    column = column + int(letter)
+                    continue
+                if letter.upper() not in PIECE_NAMES or column >= SIZE:
+                    raise ValueError("Bad FEN row: " + rows[row])
+                if letter.isupper():
+                    color = COLORS[WHITE]
+                else:
+                    color = COLORS[BLACK]
+                self.addPiece(pieceIndex(letter.upper(), color), (SIZE-1-row)*SIZE + column)
+                column = column + 1
+            if column != SIZE:
+                raise ValueError("Bad FEN row: " + rows[row])
+
+        if fields[1] not in COLORS:
+            raise ValueError("Bad side to move: " + fields[1])
+        self._sideToMove = COLORS.index(fields[1])
+
+        # Castling rights are only kept if the King and
+        # Rook are still on their squares
+        for letter, rights, kingSquare, rookSquare in FEN_CASTLING:
+            if letter.isupper():
+                side = WHITE
+            else:
+                side = BLACK
+            if letter in fields[2] and self._squares[kingSquare] == 6*side + KING and \
+               self._squares[rookSquare] == 6*side + ROOK:
+                self._castling |= rights
+
+        # Like makeMove, the en passant square is only
+        # kept if a Pawn can take there
+        if fields[3] != "-":
+            square = SQUARE_INDEX[fields[3].upper()]
+            if PAWN_ATTACKS[1 - self._sideToMove][square] & self._pieces[6*self._sideToMove + PAWN]:
+                self._enPassant = square
+
+        self._hash = self.computeHash()
+
+    # Writes the position as a FEN string. The board
+    # doesn't count moves, so the counters are "0 1".
+    #
+    # Returns:
+    #   fen - String
+    def getFen(self):
+        rows = []
+
+        for row in range(SIZE-1, -1, -1):
+            text = ""
+            empty = 0
+            for column in range(SIZE):
+                piece = self._squares[row*SIZE + column]
+                if piece == None:
+                    empty = empty + 1
+                    continue
+                if empty:
+                    text = text + str(empty)
+                    empty = 0
+                if piece//6 == WHITE:
+                    text = text + PIECE_NAMES[piece%6]
+                else:
+                    text = text + PIECE_NAMES[piece%6].lower()
+            if empty:
+                text = text + str(empty)
+            rows.append(text)
+
+        castling = "".join([letter for letter, rights, kingSquare, rookSquare in FEN_CASTLING \
+                            if self._castling & rights])
+        if self._enPassant == None:
+            enPassant = "-"
+        else:
+            enPassant = SQUARE_NAMES[self._enPassant].lower()
 
-        # Make calls to draw board and pieces
-        self.drawBoard()
-        self.drawPieces()
+        return " ".join(["/".join(rows), COLORS[self._sideToMove], castling or "-", enPassant, "0", "1"])
+
+    # Packs the position into a few bytes, to send it
+    # to another process (see unpack).
+    #
+    # Returns:
+    #   packed - bytes
+    def pack(self):
+        if self._enPassant == None:
+            enPassant = -1
+        else:
+            enPassant = self._enPassant
+
+        return struct.pack(PACK_FORMAT, *self._pieces, self._sideToMove, self._castling, enPassant)
+
+    # Sets up a position packed by pack, without
+    # drawing anything.
+    #
+    # Parameters:
+    #   packed - bytes
+    def unpack(self, packed):
+        fields = struct.unpack(PACK_FORMAT, packed)
+
+        self.clear()
+        for piece in range(2*6):
+            for square in squaresOf(fields[piece]):
+                self.addPiece(piece, square)
+
+        self._sideToMove = fields[12]
+        self._castling = fields[13]
+        if fields[14] >= 0:
+            self._enPassant = fields[14]
+        self._hash = self.computeHash()
 
     # Draws every piece on the board.
     def drawPieces(self):
+        from ezgraphics import GraphicsImage
+
         canvas = self._canvas
         
-        for i in range(SIZE):
-            for j in range(SIZE):
-                piece = self._board[i][j]
+        for square in squaresOf(self._occupied):
+            piece = PIECES[self._squares[square]]
+            j, i = ROWS_AND_COLUMNS[square]
 
-                if piece != None:
-                    piece = piece.getColor()+piece.getName()
-                    # Gets image file (png) from pieces folder
-                    piecePic = GraphicsImage("pieces/"+piece+".png")
-                    
-                    canvas.drawImage(3/2*SQUARESIZE+(i)*SQUARESIZE-32, \
-                                (j+1)*SQUARESIZE+5, piecePic)
+            piece = piece.getColor()+piece.getName()
+            # Gets image file (png) from pieces folder
+            piecePic = GraphicsImage("pieces/"+piece+".png")
+            
+            canvas.drawImage(3/2*SQUARESIZE+(i)*SQUARESIZE-32, \
+                        (j+1)*SQUARESIZE+5, piecePic)
 
     # Draws the board
     def drawBoard(self):
@@ -216,7 +837,7 @@ class Board:
 
     # Resets the board setup
     def resetBoard(self):
-        self._board =[[None for i in range(SIZE)]for j in range(SIZE)]
+        self.clear()
         self.initialize()
 
     # Used to find the row and column of each position
@@ -226,12 +847,7 @@ class Board:
     # Returns:
     #   (row, column) - int
     def findRowAndColumn(self, position):
-        columns = ["A", "B", "C", "D", "E", "F", "G", "H"]
-        
-        column = columns.index(position[0])
-        row = SIZE - int(position[1])
-
-        return row, column
+        return ROWS_AND_COLUMNS[SQUARE_INDEX[position]]
 
     # Used to draw individual squares
     #
@@ -4,56 +4,216 @@
 # This file is the AI portion of the chess program.
 # It is the main DeepYellowJ part. It finds the best
 # move from all the moves in each board setup. 
+#
+# There are two modes:
+#   "search" - looks ahead with an alpha-beta search
+#              (see search.py)
+#   "simple" - scores each move by the position right
+#              after it (see calculateMove)
+#
+# In "search" mode more than one process can search
+# (see smp.py). In "simple" mode the moves can be
+# split between processes, which each score a group
+# of them. The processes are started once and kept
+# for the whole game.
 
 # Import classes from other files
 from board import Board
+from squares import SQUARE_NAMES, SQUARE_INDEX, ROWS_AND_COLUMNS
+from bitboard import PIECE_NAMES
+from movegenerator import PROMOTE_KNIGHT, moveCurrent, moveNew, moveName
+from transpositiontable import TranspositionTable, EXACT
+from search import Search, MAX_PLY
+from smp import LazySMP
+from timemanager import TimeManager
 
-# Import randint for selecting random moves
-from random import randint
+# Import the pool used to score moves in other processes
+from concurrent.futures import ProcessPoolExecutor
 
 # Board Size
 SIZE = 8
 
+# Depth searched when there is no time limit
+DEFAULT_DEPTH = 3
+
+# Weight of each kind of piece in calculateMove, in
+# bitboard order (Pawn, Knight, Bishop, Rook, Queen, King)
+SHANNON_VALUES = [1, 3, 3, 5, 9, 200]
+
+# Megabytes for the table calculateMove keeps its scores
+# in. It is not the search's table, the scores there are
+# in centipawns and these are not.
+SCORE_TABLE_MB = 1
+
+# The DeepYellowJ a worker process scores moves with
+workerAI = None
+
+# Starts a worker process for "simple" mode.
+#
+# Parameters:
+#   color    - String
+#   hashSize - int
+def startWorker(color, hashSize):
+    global workerAI
+    workerAI = DeepYellowJ(color, Board(), hashSize, mode="simple")
+
+# Scores a group of moves in a worker process.
+#
+# Parameters:
+#   packed - bytes (the position, see Board.pack)
+#   moves  - [int]
+# Returns:
+#   scores - [int]
+def scoreMovesInWorker(packed, moves):
+    return workerAI.scorePackedMoves(packed, moves)
+
 class DeepYellowJ:
     # Constructor for DeepYellowJ.
     #
     # Parameters:
-    #   move  - String
-    #   board - Board
-    def __init__(self, color, board):
+    #   color    - String
+    #   board    - Board
+    #   hashSize - int (=16, megabytes for the transposition table)
+    #   depth    - int (=None, most moves to look ahead in "search"
+    #              mode; DEFAULT_DEPTH if there is no time limit)
+    #   mode     - String (="search", or "simple")
+    #   moveTime - float (=None, seconds to search each move)
+    #   options  - {} (=None, keyword options for Search, see search.py)
+    #   processes - int (=1, processes to search or score moves with)
+    def __init__(self, color, board, hashSize=16, depth=None, mode="search", moveTime=None, \
+                 options=None, processes=1):
+        if mode not in ("search", "simple"):
+            raise ValueError("Unknown mode: " + str(mode))
+
         self._color = color
         self._board = board
+        if options == None:
+            options = {}
+
+        # With more than one process the table is shared
+        # ("search") or each process has its own ("simple")
+        self._smp = None
+        self._pool = None
+        self._processes = processes
+        if mode == "search" and processes > 1:
+            self._table = TranspositionTable(hashSize, shared=True)
+            self._search = Search(board, self._table, **options)
+            self._smp = LazySMP(self._search, self._table, hashSize, processes, options)
+        else:
+            self._table = TranspositionTable(hashSize)
+            self._search = Search(board, self._table, **options)
+            if mode == "simple" and processes > 1:
+                self._pool = ProcessPoolExecutor(processes, initializer=startWorker, \
+                                                 initargs=(color, hashSize))
+        # Scores found by calculateMove ("simple" mode)
+        self._scoreTable = None
+        if mode == "simple":
+            self._scoreTable = TranspositionTable(SCORE_TABLE_MB)
+
+        self._depth = depth
+        self._mode = mode
+        self._moveTime = moveTime
+        self._timeLeft = None
+        self._increment = 0
+        self._score = 0
+        self._principalVariation = []
         
-    # Finds the best move at a given position.
+    # Finds the best move at a given position. A
+    # promotion also has the piece the Pawn becomes.
+    # It has to be DeepYellowJ's move.
     #
     # Returns:
-    #   moves - []  
+    #   moves - [] (for example ["E2", "E4"] or ["E7", "E8", "N"],
+    #           None if there are no legal moves)
     def findMove(self):
-        # Gets all possible moves
-        allMoves = self.findAllMoves()
-
-        # Used to calculate moves and f(move)
-        potentialMoves = []
-        potentialMovesScore = []
-
-        # Gets 24 Random Moves
-        for i in range(3*SIZE):
-            movePosition = randint(0, len(allMoves)-1)
-            pieceToMove = allMoves[movePosition][0]
-            positionToMoveTo = allMoves[movePosition][1][randint(0, len(allMoves[movePosition][1])-1)]
-            moves = [pieceToMove, positionToMoveTo]
-            potentialMoves.append(moves)
-
-        # Calculates the f-score for each selected move
-        for i in range(len(potentialMoves)):
-            moveScore = self.calculateMove(potentialMoves[i])
-            potentialMovesScore.append(moveScore)
-
-        # Returns the max move
-        move = potentialMoves[potentialMovesScore.index(max(potentialMovesScore))]
-
-        return move
+        self.checkTurn()
+
+        # Checkmate or stalemate, there is nothing to find
+        for move in self._board.generateLegalMoves():
+            break
+        else:
+            return None
+
+        if self._mode == "search":
+            depth = self._depth
+            timeManager = None
+
+            if self._moveTime != None or self._timeLeft != None:
+                timeManager = TimeManager(self._moveTime, self._timeLeft, self._increment)
+                if depth == None:
+                    depth = MAX_PLY
+            elif depth == None:
+                depth = DEFAULT_DEPTH
+
+            if self._smp != None:
+                self._score, self._principalVariation = self._smp.search(self._board, depth, \
+                                                                          timeManager)
+            else:
+                self._score, self._principalVariation = self._search.search(depth, timeManager)
+            move = self._principalVariation[0]
+        else:
+            # Gets all possible moves
+            allMoves = self.findAllMoves()
+
+            # Calculates the f-score for each move
+            potentialMovesScore = self.scoreMoves(allMoves)
+
+            # Takes the max move
+            self._score = max(potentialMovesScore)
+            move = allMoves[potentialMovesScore.index(self._score)]
+            self._principalVariation = [move]
+
+        # Names are only used here
+        moves = [SQUARE_NAMES[moveCurrent(move)], SQUARE_NAMES[moveNew(move)]]
+        if move >> 12 >= PROMOTE_KNIGHT:
+            moves.append(PIECE_NAMES[(move >> 12) - 3])
+        return moves
     
+    # Sets the time left on DeepYellowJ's clock, used
+    # to time the next move (with the move time, if
+    # there is one, as a limit).
+    #
+    # Parameters:
+    #   timeLeft  - float (seconds, None for no clock)
+    #   increment - float (=0, seconds added after each move)
+    def setClock(self, timeLeft, increment=0):
+        self._timeLeft = timeLeft
+        self._increment = increment
+
+    # Scores moves with calculateMove, splitting them
+    # between the worker processes if there are any.
+    #
+    # Parameters:
+    #   moves  - [int]
+    # Returns:
+    #   scores - [int] (in the same order as moves)
+    def scoreMoves(self, moves):
+        if self._pool == None:
+            return [self.calculateMove(move) for move in moves]
+
+        # Each process gets one group of moves
+        processes = self._processes
+        groups = [moves[i::processes] for i in range(processes)]
+        packed = self._board.pack()
+        groupScores = list(self._pool.map(scoreMovesInWorker, [packed]*processes, groups))
+
+        scores = [0]*len(moves)
+        for i in range(processes):
+            scores[i::processes] = groupScores[i]
+        return scores
+
+    # Sets up a packed position (see Board.pack) and
+    # scores moves in it. Used by the worker processes.
+    #
+    # Parameters:
+    #   packed - bytes
+    #   moves  - [int]
+    # Returns:
+    #   scores - [int]
+    def scorePackedMoves(self, packed, moves):
+        self._board.unpack(packed)
+        return [self.calculateMove(move) for move in moves]
+
     # Finds the heuristic function value for a given
     # move (move). The heuristic function currently
     # used is a modification of Claude Shannon. This
@@ -61,484 +221,138 @@ class DeepYellowJ:
     # a Computer for Playing Chess".
     #
     # Parameters:
-    #   move - String
+    #   move - int (see movegenerator.py)
     # Returns:
     #   f    - int  
     def calculateMove(self, move):
-        columns = ["A", "B", "C", "D", "E", "F", "G", "H"]
-        # Used to count Pawns, Bishops, Knights, Rooks, Queens, and Kings
-        pieceCountSelf = [0, 0, 0, 0, 0, 0]
-        pieceCountOpponent = [0, 0, 0, 0, 0, 0]
-
-        # Used to copy board
-        board = Board()
-
-        # Copies the pieces from self._board
-        for i in range(SIZE):
-            for j in range(SIZE):
-                square = columns[j]+str(SIZE-i)
-                piece = self._board.getPiece(square)
-
-                if piece != None:
-                    board.putPiece(piece.getName(), piece.getColor, square)
-
-        # Moves piece
-        board.move2(move[0], move[1])
-
-        # Used to count the number of each type of piece
-        for i in range(SIZE):
-            for j in range(SIZE):
-                square = columns[j]+str(SIZE-i)
-                piece = board.getPiece(square)
-
-                if piece != None:
-                    if piece.getColor() == self._color:
-                        if piece.getName() == "P":
-                            pieceCountSelf[0] = pieceCountSelf[0]+1
-                        elif piece.getName() == "B":
-                            pieceCountSelf[1] = pieceCountSelf[1]+1
-                        elif piece.getName() == "N":
-                            pieceCountSelf[2] = pieceCountSelf[2]+1
-                        elif piece.getName() == "R":
-                            pieceCountSelf[3] = pieceCountSelf[3]+1
-                        elif piece.getName() == "Q":
-                            pieceCountSelf[4] = pieceCountSelf[4]+1
-                        elif piece.getName() == "K":
-                            pieceCountSelf[5] = pieceCountSelf[5]+1
-                    else:
-                        if piece.getName() == "P":
-                            pieceCountOpponent[0] = pieceCountOpponent[0]+1
-                        elif piece.getName() == "B":
-                            pieceCountOpponent[1] = pieceCountOpponent[1]+1
-                        elif piece.getName() == "N":
-                            pieceCountOpponent[2] = pieceCountOpponent[2]+1
-                        elif piece.getName() == "R":
-                            pieceCountOpponent[3] = pieceCountOpponent[3]+1
-                        elif piece.getName() == "Q":
-                            pieceCountOpponent[4] = pieceCountOpponent[4]+1
-                        elif piece.getName() == "K":
-                            pieceCountOpponent[5] = pieceCountOpponent[5]+1
-
-        # Calculates f(move)             
-        f = 200*(pieceCountSelf[5] - pieceCountOpponent[5]) + \
-            9*(pieceCountSelf[4] - pieceCountOpponent[4]) + \
-            5*(pieceCountSelf[3] - pieceCountOpponent[3]) + \
-            3*(pieceCountSelf[2] - pieceCountOpponent[2]) + \
-            3*(pieceCountSelf[1] - pieceCountOpponent[1]) + \
-            1*(pieceCountSelf[0] - pieceCountOpponent[0])
-
-        return f
-    
-    # Finds all moves at a given board setup.
-    # 
-    # Returns:
-    #   allMoves - []  
-    def findAllMoves(self):
-        columns = ["A", "B", "C", "D", "E", "F", "G", "H"]
-        allMoves = []
-
-        # Goes through each square
-        for i in range(SIZE):
-            for j in range(SIZE):
-                square = columns[j]+str(SIZE-i)
-                piece = self._board.getPiece(square)
-
-                # Checks only self's pieces
-                if piece != None and piece.getColor() == self._color:
-                    if piece.getName() == "P":
-                        moves = [square, self.findPawnMoves(square)]
-                    elif piece.getName() == "B":
-                        moves = [square, self.findBishopMoves(square)]
-                    elif piece.getName() == "N":
-                        moves = [square, self.findKnightMoves(square)]
-                    elif piece.getName() == "R":
-                        moves = [square, self.findRookMoves(square)]
-                    elif piece.getName() == "Q":
-                        moves = [square, self.findQueenMoves(square)]
-                    elif piece.getName() == "K":
-                        moves = [square, self.findKingMoves(square)]
-
-                    # If moves found, then append
-                    if len(moves[1]) != 0:
-                        allMoves.append(moves)
-
-        return allMoves
-
-    # Finds all moves at a given position (current)
-    # for a given direction. Please note that the
-    # parameter longDistance is used to determine if
-    # piece can move multiple spaces in one move.
-    #
-    # Parameters:
-    #   current      - String
-    #   rowMove      - int
-    #   columnMove   - int
-    #   longDistance - Boolean (=False)
-    # Returns:
-    #   moves        - []    
-    def findMovesForPiece(self, current, rowMove, columnMove, longDistance=False):
-        columns = ["A", "B", "C", "D", "E", "F", "G", "H"]
-        moves = []
-        currentPiece = self._board.getPiece(current)
-
-        # If piece isn't in current space
-        if currentPiece != None:
-            currentColor = currentPiece.getColor()
-        else:
-            return moves
-
-        # If piece can move multiple spaces in one move
-        if longDistance:
-            currentLetter = current[0]
-            currentNumber = int(current[1])
-            currentLetterIndex = columns.index(currentLetter)
-
-            # Move the piece one space
-            currentLetterIndex = currentLetterIndex + columnMove
-            currentNumber = currentNumber + rowMove
-
-            # Determine if legal move
-            if ((currentLetterIndex > -1 and currentLetterIndex < 8) \
-                and (currentNumber > 0 and currentNumber < 9)):
-                current = columns[currentLetterIndex]+str(currentNumber)
-            else:
-                return moves
-            
-            # Move piece until new/out of board/current is occupied                
-            while self._board.getPiece(current) == None:
-                moves.append(current)
-                
-                currentLetter = current[0]
-                currentNumber = int(current[1])
-                currentLetterIndex = columns.index(currentLetter)
-
-                # Move one space
-                currentLetterIndex = currentLetterIndex + columnMove
-                currentNumber = currentNumber + rowMove
-
-                # Checks if current is on board
-                if ((currentLetterIndex > -1 and currentLetterIndex < 8) \
-                    and (currentNumber > 0 and currentNumber < 9)):
-                    current = columns[currentLetterIndex]+str(currentNumber)
-                else:
-                    return moves               
-
-            piece = self._board.getPiece(current)
-
-            # Checks so space is not one's own piece            
-            if piece.getColor() != self._color:
-                moves.append(current)
+        board = self._board
 
-        else:
-            currentLetter = current[0]
-            currentNumber = int(current[1]) + rowMove
-            currentLetterIndex = columns.index(currentLetter) + columnMove
+        # Makes the move on the board
+        undo = board.makeMove(move)
 
-            # Checks if current + move = new 
-            if ((currentLetterIndex > -1 and currentLetterIndex < 8) \
-                and (currentNumber > 0 and currentNumber < 9)):
-                current = columns[currentLetterIndex]+str(currentNumber)
-                moves.append(current)
+        # The table keeps scores for the side to move
+        side = board.getSideToMove()
 
-        return moves
-
-    # Finds all Pawn moves at a given position (square)
-    #
-    # Parameters:
-    #   square    - String
-    # Returns:
-    #   pawnMoves - []
-    def findPawnMoves(self, square):
-        piece = self._board.getPiece(square)
-
-        # Used to determine the direction
-        # the pawn is heading
-        if piece.getColor() == "b":
-            constant = -1
+        entry = self._scoreTable.probe(board.getHash())
+        if entry != None:
+            f = entry[1]
         else:
-            constant = 1        
+            # The board keeps count of each kind of piece
+            counts = board.getPieceCounts()
+            own = 6*board.getSideIndex()
+            opponent = 6*(1 - board.getSideIndex())
 
-        # Finds the moves in each direction
-        move1 = self.findMovesForPiece(square, constant, 0)
-        move2 = self.findMovesForPiece(square, constant, -1)
-        move3 = self.findMovesForPiece(square, constant, 1)
+            # Calculates f(move)
+            f = 0
+            for piece in range(6):
+                f = f + SHANNON_VALUES[piece]*(counts[own + piece] - counts[opponent + piece])
 
-        # Used to determine pawn can move two spaces
-        if len(move1) != 0:
-            piece1 = self._board.getPiece(move1[0])
-        else:
-            piece1 = False
+            self._scoreTable.store(board.getHash(), 0, f, EXACT)
 
-        # Used to determine if pawn can take diagonal
-        if len(move2) != 0:       
-            piece2 = self._board.getPiece(move2[0])
-        else:
-            piece2 = None
+        # Takes the move back
+        board.unmakeMove(undo)
 
-        # Used to determine if pawn can take diagonal
-        if len(move3) != 0:
-            piece3 = self._board.getPiece(move3[0])
-        else:
-            piece3 = None
-
-        # If there is piece, pawn cannot move up
-        if piece1 != None:
-            move1 = []
-
-        # If opponent's piece is not diagonal, pawn
-        # cannot take piece. 
-        if piece2 == None or piece2.getColor() == self._color:
-            move2 = []
-
-        # If opponent's piece is not diagonal, pawn
-        # cannot take piece. 
-        if piece3 == None or piece3.getColor() == self._color:
-            move3 = []
-
-        # Determines if pawn can move two spaces
-        if not piece.getPieceMoved() and piece1 == None:
-            move4 = self.findMovesForPiece(square, 2*constant, 0)
-            if len(move4) != 0:
-                piece4 = self._board.getPiece(move4[0])
-                if piece4 != None:
-                    move4 = []
-        else:
-            move4 = []                    
+        if side != self._color:
+            f = -f
 
-        # Combine the move1...move4 arrays
-        pawnMoves = self.combineArrays(move1, move2)
-        pawnMoves = self.combineArrays(pawnMoves, move3)
-        pawnMoves = self.combineArrays(pawnMoves, move4)
+        return f
+    
+    # Returns the score of the last move found, for
+    # DeepYellowJ's side, which was the side to move
+    # (centipawns in "search" mode).
+    #
+    # Returns:
+    #   score - int
+    def getScore(self):
+        return self._score
 
-        # Returns all Pawn moves
-        return pawnMoves
+    # Returns the moves the last search expects to be
+    # played, starting with the move found.
+    #
+    # Returns:
+    #   moves - [String] (for example ["E2E4", "E7E5"])
+    def getPrincipalVariation(self):
+        return [moveName(move) for move in self._principalVariation]
 
-    # Finds all Bishop moves at a given position (square)
+    # Returns the depth the last search finished.
     #
-    # Parameters:
-    #   square      - String
     # Returns:
-    #   bishopMoves - []
-    def findBishopMoves(self, square):
-        # Finds the moves in each direction, True is used
-        # to state that it can move one space at a time
-        move1 = self.findMovesForPiece(square, 1, 1, True)
-        move2 = self.findMovesForPiece(square, 1, -1, True)
-        move3 = self.findMovesForPiece(square, -1, -1, True)
-        move4 = self.findMovesForPiece(square, -1, 1, True)
-
-        # Combine the move1...move4 arrays
-        bishopMoves = self.combineArrays(move1, move2)
-        bishopMoves = self.combineArrays(bishopMoves, move3)
-        bishopMoves = self.combineArrays(bishopMoves, move4)
-
-        # Returns all Bishop moves
-        return bishopMoves
-
-    # Finds all Knight moves at a given position (square)
+    #   depth - int
+    def getDepth(self):
+        if self._smp != None:
+            return self._smp.getDepth()
+        return self._search.getDepth()
+
+    # Returns the number of positions the last search
+    # looked at.
     #
-    # Parameters:
-    #   square      - String
     # Returns:
-    #   knightMoves - []
-    def findKnightMoves(self, square):
-        # Finds the moves in each direction
-        move1 = self.findMovesForPiece(square, 1, 2)
-        move2 = self.findMovesForPiece(square, 1, -2)
-        move3 = self.findMovesForPiece(square, -1, 2)
-        move4 = self.findMovesForPiece(square, -1, -2)
-        move5 = self.findMovesForPiece(square, 2, 1)
-        move6 = self.findMovesForPiece(square, 2, -1)
-        move7 = self.findMovesForPiece(square, -2, 1)
-        move8 = self.findMovesForPiece(square, -2, -1)
-
-        # Checks if move1...move8 is occupied by one's piece
-        if len(move1) != 0:
-            piece1 = self._board.getPiece(move1[0])
-            if piece1 != None and piece1.getColor() == self._color:
-                move1 = []
-            
-        if len(move2) != 0:
-            piece2 = self._board.getPiece(move2[0])
-            if piece2 != None and piece2.getColor() == self._color:
-                move2 = []
-
-        if len(move3) != 0:
-            piece3 = self._board.getPiece(move3[0])
-            if piece3 != None and piece3.getColor() == self._color:
-                move3 = []
-
-        if len(move4) != 0:
-            piece4 = self._board.getPiece(move4[0])
-            if piece4 != None and piece4.getColor() == self._color:
-                move4 = []
-
-        if len(move5) != 0:
-            piece5 = self._board.getPiece(move5[0])
-            if piece5 != None and piece5.getColor() == self._color:
-                move5 = []
-            
-        if len(move6) != 0:
-            piece6 = self._board.getPiece(move6[0])
-            if piece6 != None and piece6.getColor() == self._color:
-                move6 = []
-
-        if len(move7) != 0:
-            piece7 = self._board.getPiece(move7[0])
-            if piece7 != None and piece7.getColor() == self._color:
-                move7 = []
-
-        if len(move8) != 0:
-            piece8 = self._board.getPiece(move8[0])
-            if piece8 != None and piece8.getColor() == self._color:
-                move8 = []
-
-        # Combine the move1...move8 arrays
-        knightMoves = self.combineArrays(move1, move2)
-        knightMoves = self.combineArrays(knightMoves, move3)
-        knightMoves = self.combineArrays(knightMoves, move4)
-        knightMoves = self.combineArrays(knightMoves, move5)
-        knightMoves = self.combineArrays(knightMoves, move6)
-        knightMoves = self.combineArrays(knightMoves, move7)
-        knightMoves = self.combineArrays(knightMoves, move8)
-
-        # Returns all Knight moves
-        return knightMoves
-
-    # Finds all Rook moves at a given position (square)
+    #   nodes - int
+    def getNodes(self):
+        return self._search.getNodes()
+
+    # Returns what the last search did (nodes, quiescence
+    # nodes, pruning counts, see search.py).
     #
-    # Parameters:
-    #   square    - String
     # Returns:
-    #   rookMoves - []
-    def findRookMoves(self, square):
-        # Finds the moves in each direction, True is used
-        # to state that it can move one space at a time
-        move1 = self.findMovesForPiece(square, 0, 1, True)
-        move2 = self.findMovesForPiece(square, 0, -1, True)
-        move3 = self.findMovesForPiece(square, 1, 0, True)
-        move4 = self.findMovesForPiece(square, -1, 0, True)
-        
-        # Combine the move1...move4 arrays
-        rookMoves = self.combineArrays(move1, move2)
-        rookMoves = self.combineArrays(rookMoves, move3)
-        rookMoves = self.combineArrays(rookMoves, move4)
+    #   statistics - {}
+    def getSearchStatistics(self):
+        return self._search.getStatistics()
 
-        # Returns all Rook moves
-        return rookMoves
+    # Returns how often the first move searched caused
+    # a cutoff (see moveordering.py).
+    #
+    # Returns:
+    #   statistics - {}
+    def getOrderingStatistics(self):
+        return self._search.getOrderingStatistics()
 
-    # Finds all Queen moves at a given position (square)
+    # Returns how often the Pawn score was found in
+    # the pawn table (see pawnstructure.py).
     #
-    # Parameters:
-    #   square     - String
     # Returns:
-    #   queenMoves - []
-    def findQueenMoves(self, square):
-        # Finds the moves in each direction, True is used
-        # to state that it can move one space at a time
-        move1 = self.findMovesForPiece(square, 0, 1, True)
-        move2 = self.findMovesForPiece(square, 0, -1, True)
-        move3 = self.findMovesForPiece(square, 1, 0, True)
-        move4 = self.findMovesForPiece(square, 1, 1, True)
-        move5 = self.findMovesForPiece(square, 1, -1, True)
-        move6 = self.findMovesForPiece(square, -1, 0, True)
-        move7 = self.findMovesForPiece(square, -1, 1, True)
-        move8 = self.findMovesForPiece(square, -1, -1, True)
-
-        # Combine the move1...move8 arrays
-        queenMoves = self.combineArrays(move1, move2)
-        queenMoves = self.combineArrays(queenMoves, move3)
-        queenMoves = self.combineArrays(queenMoves, move4)
-        queenMoves = self.combineArrays(queenMoves, move5)
-        queenMoves = self.combineArrays(queenMoves, move6)
-        queenMoves = self.combineArrays(queenMoves, move7)
-        queenMoves = self.combineArrays(queenMoves, move8)
-
-        # Returns all Queen moves
-        return queenMoves
-
-    # Finds all King moves at a given position (square)
+    #   statistics - {}
+    def getPawnTableStatistics(self):
+        return self._search.getPawnTableStatistics()
+
+    # Returns how the transposition table has been used
+    # (hits, misses, overwrites, ...). In "simple" mode
+    # it is the table of calculateMove's scores.
     #
-    # Parameters:
-    #   square    - String
     # Returns:
-    #   kingMoves - []
-    def findKingMoves(self, square):
-        # Finds the moves in each direction
-        move1 = self.findMovesForPiece(square, 0, 1)
-        move2 = self.findMovesForPiece(square, 0, -1)
-        move3 = self.findMovesForPiece(square, 1, 0)
-        move4 = self.findMovesForPiece(square, 1, 1)
-        move5 = self.findMovesForPiece(square, 1, -1)
-        move6 = self.findMovesForPiece(square, -1, 0)
-        move7 = self.findMovesForPiece(square, -1, 1)
-        move8 = self.findMovesForPiece(square, -1, -1)
-
-        # Checks if move1...move8 is occupied by one's piece
-        if len(move1) != 0:
-            piece1 = self._board.getPiece(move1[0])
-            if piece1 != None and piece1.getColor() == self._color:
-                move1 = []
-            
-        if len(move2) != 0:
-            piece2 = self._board.getPiece(move2[0])
-            if piece2 != None and piece2.getColor() == self._color:
-                move2 = []
-
-        if len(move3) != 0:
-            piece3 = self._board.getPiece(move3[0])
-            if piece3 != None and piece3.getColor() == self._color:
-                move3 = []
-
-        if len(move4) != 0:
-            piece4 = self._board.getPiece(move4[0])
-            if piece4 != None and piece4.getColor() == self._color:
-                move4 = []
-
-        if len(move5) != 0:
-            piece5 = self._board.getPiece(move5[0])
-            if piece5 != None and piece5.getColor() == self._color:
-                move5 = []
-            
-        if len(move6) != 0:
-            piece6 = self._board.getPiece(move6[0])
-            if piece6 != None and piece6.getColor() == self._color:
-                move6 = []
-
-        if len(move7) != 0:
-            piece7 = self._board.getPiece(move7[0])
-            if piece7 != None and piece7.getColor() == self._color:
-                move7 = []
-
-        if len(move8) != 0:
-            piece8 = self._board.getPiece(move8[0])
-            if piece8 != None and piece8.getColor() == self._color:
-                move8 = []
-
-        # Combine the move1...move8 arrays
-        kingMoves = self.combineArrays(move1, move2)
-        kingMoves = self.combineArrays(kingMoves, move3)
-        kingMoves = self.combineArrays(kingMoves, move4)
-        kingMoves = self.combineArrays(kingMoves, move5)
-        kingMoves = self.combineArrays(kingMoves, move6)
-        kingMoves = self.combineArrays(kingMoves, move7)
-        kingMoves = self.combineArrays(kingMoves, move8)
-
-        # Return all King moves
-        return kingMoves
-
-    # Combines two arrays. It is used to
-    # combine to arrays of moves.
+    #   statistics - {}
+    def getTableStatistics(self):
+        if self._scoreTable != None:
+            return self._scoreTable.getStatistics()
+        return self._table.getStatistics()
+
+    # Ends the helper or worker processes and frees
+    # the shared table, if more than one process is used.
+    def close(self):
+        if self._smp != None:
+            self._smp.close()
+            self._table.close()
+            self._smp = None
+        if self._pool != None:
+            self._pool.shutdown()
+            self._pool = None
+
+    # Finds all legal moves at a given board setup
+    # (see movegenerator.py). It has to be
+    # DeepYellowJ's move.
     # 
-    # Parameters:
-    #   array1 - []
-    #   array2 - []
     # Returns:
-    #   array1 - []
-    def combineArrays(self, array1, array2):
-        for i in range(len(array2)):
-            array1.append(array2[i])
-        return array1
+    #   allMoves - []  
+    def findAllMoves(self):
+        self.checkTurn()
+        return list(self._board.generateLegalMoves())
+
+    # Checks that it is DeepYellowJ's move. The moves
+    # found and the scores are for the side to move,
+    # so they would be the opponent's otherwise.
+    def checkTurn(self):
+        if self._board.getSideToMove() != self._color:
+            raise ValueError("It is not " + str(self._color) + "'s move")
 
     # Used to find the row and column of each position
     #
@@ -547,9 +361,4 @@ class DeepYellowJ:
     # Returns:
     #   (row, column) - int
     def findRowAndColumn(self, position):
-        columns = ["A", "B", "C", "D", "E", "F", "G", "H"]
-        
-        column = columns.index(position[0])
-        row = SIZE - int(position[1])
-
-        return row, column
+        return ROWS_AND_COLUMNS[SQUARE_INDEX[position]]
@@ -0,0 +1,177 @@
+## DeepYellowJ - Version 0.1 (c) 2016 Ahmad Nazeri
+#    Evaluator - evaluator.py
+#
+# This file scores a position for the search. The
+# score is in centipawns (a Pawn is 100) and is from
+# the point of view of the side to move, so a better
+# position for the side to move is a higher number.
+#
+# The score is the material plus the piece-square
+# tables (see piecesquare.py). The middlegame and
+# endgame tables are blended by the game phase: with
+# all the pieces on the board only the middlegame
+# table counts, and as they are taken the endgame
+# table counts more. The board keeps all the sums up
+# to date, so nothing is counted here. The Pawns are
+# scored too (see pawnstructure.py), found in a
+# PawnTable most of the time.
+#
+# Last come the terms that need the squares each side
+# attacks (see attackmap.py): mobility, pressure on
+# the Kings and hanging pieces. The maps are found
+# once for a position and kept, so the search can use
+# the same ones for check and exchanges.
+
+# Import the bitboard helpers
+from bitboard import WHITE, BLACK, PAWN, KNIGHT, KING, PIECE_VALUES, popCount
+from attackmap import AttackMaps
+from piecesquare import getPhaseMax
+from pawnstructure import PawnTable, PAWN_TABLE_KB
+
+# How much a quiet move (futility) or the best line
+# (razoring) could still gain, by the depth left. Used
+# by the search to skip moves near the leaves.
+FUTILITY_MARGINS = [0, 200, 450]
+RAZOR_MARGINS = [0, 300, 500, 700]
+
+# Centipawns for each square a kind of piece can go
+# to that isn't taken by its own side or attacked by
+# the opponent's Pawns
+MOBILITY_WEIGHTS = [0, 4, 3, 2, 1, 0]
+
+# Centipawns taken off for each square around a King
+# attacked by a kind of the opponent's pieces
+KING_ZONE_WEIGHTS = [0, 5, 5, 7, 10, 0]
+
+# Centipawns taken off for each piece attacked and
+# not defended
+HANGING_PENALTY = 15
+
+class Evaluator:
+    # Constructor for Evaluator.
+    #
+    # Parameters:
+    #   pawnTableKB - int (=PAWN_TABLE_KB, size of the PawnTable)
+    #   attackTerms - Boolean (=True, score mobility, King pressure
+    #                 and hanging pieces)
+    def __init__(self, pawnTableKB=PAWN_TABLE_KB, attackTerms=True):
+        self._values = PIECE_VALUES
+        self._pawnTable = PawnTable(pawnTableKB)
+        self._attackTerms = attackTerms
+        self._attackMaps = None
+        self._attackMapsHash = None
+        self._futilityMargins = FUTILITY_MARGINS
+        self._razorMargins = RAZOR_MARGINS
+
+    # Scores a position by material and where the
+    # pieces are, blended by the game phase, by its
+    # Pawns and by what the pieces attack.
+    #
+    # Parameters:
+    #   board - Board
+    # Returns:
+    #   score - int (centipawns for the side to move)
+    def evaluate(self, board):
+        middlegame, endgame = board.getPieceSquareScores()
+        phaseMax = getPhaseMax()
+        phase = min(board.getPhase(), phaseMax)
+
+        score = board.getMaterial() + (middlegame*phase + endgame*(phaseMax - phase))//phaseMax
+        score = score + self._pawnTable.evaluate(board)[0]
+
+        if self._attackTerms:
+            score = score + self.evaluateAttacks(self.getAttackMaps(board))
+
+        if board.getSideIndex() == BLACK:
+            return -score
+        return score
+
+    # Scores mobility, pressure on the Kings and hanging
+    # pieces from the attack maps.
+    #
+    # Parameters:
+    #   maps  - AttackMaps
+    # Returns:
+    #   score - int (centipawns for White)
+    def evaluateAttacks(self, maps):
+        score = 0
+
+        for side, sign in [(WHITE, 1), (BLACK, -1)]:
+            opponent = 1 - side
+            area = ~maps.getOccupancy(side) & ~maps.getPieceAttacks(opponent, PAWN)
+            kingZone = maps.getKingZone(opponent)
+            sideScore = -HANGING_PENALTY*popCount(maps.getHanging(side))
+
+            for piece in range(KNIGHT, KING):
+                attacks = maps.getPieceAttacks(side, piece)
+                sideScore = sideScore + MOBILITY_WEIGHTS[piece]*popCount(attacks & area) + \
+                            KING_ZONE_WEIGHTS[piece]*popCount(attacks & kingZone)
+
+            score = score + sign*sideScore
+
+        return score
+
+    # Finds the attack maps of a position (see
+    # attackmap.py). The maps of the last position
+    # asked for are kept, so the evaluation and the
+    # search share them.
+    #
+    # Parameters:
+    #   board - Board
+    # Returns:
+    #   maps  - AttackMaps
+    def getAttackMaps(self, board):
+        if self._attackMapsHash != board.getHash():
+            self._attackMaps = AttackMaps(board)
+            self._attackMapsHash = board.getHash()
+        return self._attackMaps
+
+    # Finds if the evaluation uses the attack maps.
+    #
+    # Returns:
+    #   attackTerms - Boolean
+    def hasAttackTerms(self):
+        return self._attackTerms
+
+    # Returns how often the Pawn score was found in
+    # the PawnTable (hits, misses, hitRate).
+    #
+    # Returns:
+    #   statistics - {}
+    def getPawnTableStatistics(self):
+        return self._pawnTable.getStatistics()
+
+    # Gets the centipawn value of a kind of piece.
+    #
+    # Parameters:
+    #   piece - int (PAWN ... KING, see bitboard.py)
+    # Returns:
+    #   value - int
+    def getPieceValue(self, piece):
+        return self._values[piece]
+
+    # Gets how much a quiet move could still change
+    # the score with depth moves left (None if the
+    # depth is too deep for futility pruning).
+    #
+    # Parameters:
+    #   depth  - int
+    # Returns:
+    #   margin - int
+    def getFutilityMargin(self, depth):
+        if depth < len(self._futilityMargins):
+            return self._futilityMargins[depth]
+        return None
+
+    # Gets how far below alpha the score can be before
+    # only captures are looked at, with depth moves left
+    # (None if the depth is too deep for razoring).
+    #
+    # Parameters:
+    #   depth  - int
+    # Returns:
+    #   margin - int
+    def getRazorMargin(self, depth):
+        if depth < len(self._razorMargins):
+            return self._razorMargins[depth]
+        return None
@@ -16,12 +16,12 @@ from legalmovechecker import LegalMoveChecker
 from player import Player
 from deepYellowJ import DeepYellowJ
 
-# Import a sleep, to pause between moves
-from time import sleep
-
 # Used to determine the size of board
 SIZE = 8
 
+# Seconds DeepYellowJ thinks about each move
+MOVE_TIME = 1
+
 # Game class is the main part of DeepYellowJ.
 # It creates the board, players, and keeps track of
 # whose move, what the last move, 50 moves, and previous
@@ -31,7 +31,8 @@ class Game():
     def __init__(self):
         self._gameNotation = []
         self._board = Board()
-        self._player = [Player("w", True, self._board), Player("b", True, self._board)]
+        self._player = [Player("w", True, self._board, MOVE_TIME), \
+                        Player("b", True, self._board, MOVE_TIME)]
         self._whoseMove = 0
         self._mvChecker = LegalMoveChecker(self._board)
         self._lastMove= "" # not implemented yet
@@ -43,55 +44,64 @@ class Game():
         # Creates the chessboard and draws the board and pieces
         self._board.initialize()
 
-        while not self.isGameOver():
-            sleep(1) # used to pause between moves
-            player = self._player[self._whoseMove] 
-            moves = player.getMove() # receives move from player/DeepYellowJ
+        try:
+            while not self.isGameOver():
+                player = self._player[self._whoseMove] 
+                moves = player.getMove() # receives move from player/DeepYellowJ
 
-            # Checks if it is a legal move
-            if self._mvChecker.isLegalMove(moves[0], moves[1]):
-                # Makes the move
-                self._board.move(moves[0], moves[1])
-            else:
-                print(moves[0] + ", " +  moves[1] + " Not Legal Move")
+                # Checks if it is a legal move
+                if self._mvChecker.isLegalMove(moves[0], moves[1]):
+                    # Makes the move (with the piece a Pawn
+                    # promotes to, if there is one)
+                    self._board.move(*moves[:3])
+                else:
+                    # The same player moves again
+                    print(moves[0] + ", " +  moves[1] + " Not Legal Move")
+                    continue
 
-            # Keeps track of moves
-            self._gameNotation.append((moves[0], moves[1]))
-            
-            # Updates whose move
-            self._whoseMove = (self._whoseMove + 1)%2
+                # Keeps track of moves
+                self._gameNotation.append(tuple(moves[:3]))
+                
+                # Updates whose move
+                self._whoseMove = (self._whoseMove + 1)%2
+        finally:
+            # The game is over (or was quit), so DeepYellowJ's
+            # processes aren't needed any more
+            self.closePlayers()
+
+    # Ends the processes and frees the memory the
+    # players' DeepYellowJs use.
+    def closePlayers(self):
+        for player in self._player:
+            player.close()
 
     # Determines if the game is over
-    # Currently, see if the King is taken
+    # The game is over when the player to move
+    # has no legal moves (checkmate or stalemate).
     # 
     # Returns:
     #   gameOver - Boolean
     def isGameOver(self):
-        # Used to go through each square
-        columns = ["A", "B", "C", "D", "E", "F", "G", "H"]
-        gameOver = True
-
-        # Goes through to find the King
-        for i in range(SIZE):
-            for j in range(SIZE):
-                square = columns[j]+str(SIZE-i)
-                piece = self._board.getPiece(square)
-                player = self._player[self._whoseMove]
+        for move in self._board.generateLegalMoves():
+            return False
 
-                # Determines if the King doesn't exist               
-                if piece != None and piece.getName() == "K" and piece.getColor() == player.color():
-                    gameOver = False
-
-        return gameOver
+        return True
 
     # Restarts the Game
     def restartGame(self):
         self._gameNotation = []
-        self._board.resetBoard()
-        self._player = [Player("w", True, self._board), Player("b", True, self._board)]
+        self._whoseMove = 0
+
+        # startGame sets up and draws the board again
+        self._board.clear()
+        self.closePlayers()
+        self._player = [Player("w", True, self._board, MOVE_TIME), \
+                        Player("b", True, self._board, MOVE_TIME)]
         self._mvChecker = LegalMoveChecker(self._board)        
         self.startGame()
 
-# Starts the game!
-g = Game()
-g.startGame()
+# Starts the game! Only when run, not when imported
+# (helper processes import this file on some systems)
+if __name__ == "__main__":
+    g = Game()
+    g.startGame()
@@ -0,0 +1,244 @@
+## DeepYellowJ - Version 0.1 (c) 2016 Ahmad Nazeri
+#    Magic - magic.py
+#
+# This file makes the magic bitboard tables used
+# to find Rook and Bishop attacks. For each square,
+# the pieces that could block the slider (the mask)
+# are multiplied by a magic number and shifted, which
+# gives the index of the attack set in a table.
+#
+# Finding the magic numbers takes a while, so they
+# are found with a fixed seed (the same numbers every
+# time) and the tables are saved to CACHE_FILE as
+# JSON. Later runs just load that file, and make the
+# tables again if it can't be read or doesn't match.
+
+# Import what is needed to save and load the tables
+import os
+import json
+from bitboard import FULL, popCount
+
+# Board Size
+SIZE = 8
+
+# Seeds for the magic number search, one for each row
+# of the board. With these seeds (the ones Stockfish
+# uses) a magic number is found after a few tries.
+# Changing them (or CACHE_VERSION) makes the tables
+# get made again.
+SEEDS = [728, 10316, 55013, 32803, 12281, 15100, 16645, 255]
+CACHE_VERSION = 2
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "magic.cache")
+
+ROOK_STEPS = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+BISHOP_STEPS = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+# Random number generator (xorshift64*) used to find
+# the magic numbers. Python's own generator could change
+# between versions, this one always gives the same numbers.
+class MagicRandom:
+    # Constructor for MagicRandom.
+    #
+    # Parameters:
+    #   seed - int
+    def __init__(self, seed):
+        self._state = seed
+
+    # Returns a random 64-bit number.
+    #
+    # Returns:
+    #   number - int
+    def random(self):
+        state = self._state
+        state ^= state >> 12
+        state ^= (state << 25) & FULL
+        state ^= state >> 27
+        self._state = state
+
+        return (state * 2685821657736338717) & FULL
+
+    # Returns a random 64-bit number with few bits
+    # set. Magic numbers with few bits set work best.
+    #
+    # Returns:
+    #   number - int
+    def sparseRandom(self):
+        return self.random() & self.random() & self.random()
+
+# Finds the squares a slider attacks by stepping
+# through each direction. This is slow, it is only
+# used to fill the tables.
+#
+# Parameters:
+#   square   - int
+#   occupied - int
+#   steps    - [(int, int)]
+# Returns:
+#   attack   - int
+def slidingAttacks(square, occupied, steps):
+    attack = 0
+
+    for rowMove, columnMove in steps:
+        row = square//SIZE + rowMove
+        column = square%SIZE + columnMove
+
+        while 0 <= row < SIZE and 0 <= column < SIZE:
+            bit = 1 << (row*SIZE + column)
+            attack |= bit
+            if occupied & bit:
+                break
+            row = row + rowMove
+            column = column + columnMove
+
+    return attack
+
+# Finds the squares where a piece could block a
+# slider. The last square in each direction is left
+# out since it never blocks anything.
+#
+# Parameters:
+#   square - int
+#   steps  - [(int, int)]
+# Returns:
+#   mask   - int
+def blockerMask(square, steps):
+    mask = 0
+
+    for rowMove, columnMove in steps:
+        row = square//SIZE + rowMove
+        column = square%SIZE + columnMove
+
+        while 0 <= row+rowMove < SIZE and 0 <= column+columnMove < SIZE:
+            mask |= 1 << (row*SIZE + column)
+            row = row + rowMove
+            column = column + columnMove
+
+    return mask
+
+# Finds every subset of a mask, using the
+# carry-rippler trick.
+#
+# Parameters:
+#   mask    - int
+# Returns:
+#   subsets - []
+def maskSubsets(mask):
+    subsets = []
+    subset = 0
+
+    while True:
+        subsets.append(subset)
+        subset = (subset - mask) & mask
+        if subset == 0:
+            return subsets
+
+# Finds a magic number and attack table for one
+# square.
+#
+# Parameters:
+#   square - int
+#   steps  - [(int, int)]
+# Returns:
+#   (mask, magic, shift, table) - (int, int, int, [])
+def findMagic(square, steps):
+    mask = blockerMask(square, steps)
+    bits = popCount(mask)
+    shift = 64 - bits
+
+    occupancies = maskSubsets(mask)
+    attacks = [slidingAttacks(square, occupied, steps) for occupied in occupancies]
+    pairs = list(zip(occupancies, attacks))
+    random = MagicRandom(SEEDS[square//SIZE])
+
+    # tried[index] is the try that last filled table[index],
+    # so the table doesn't need clearing between tries
+    table = [0 for i in range(1 << bits)]
+    tried = [0 for i in range(1 << bits)]
+    tries = 0
+
+    while True:
+        magic = random.sparseRandom()
+
+        # Quickly skips numbers that can't spread the mask
+        if popCount((mask * magic) & 0xFF00000000000000) < 6:
+            continue
+
+        tries = tries + 1
+        for occupied, attack in pairs:
+            index = ((occupied * magic) & FULL) >> shift
+            if tried[index] != tries:
+                tried[index] = tries
+                table[index] = attack
+            elif table[index] != attack:
+                break
+        else:
+            return mask, magic, shift, table
+
+# Makes the Rook and Bishop tables for every square.
+#
+# Returns:
+#   tables - {}
+def makeTables():
+    tables = {"version": CACHE_VERSION, "seeds": SEEDS}
+
+    for name, steps in [("rook", ROOK_STEPS), ("bishop", BISHOP_STEPS)]:
+        found = [findMagic(square, steps) for square in range(SIZE*SIZE)]
+        tables[name] = [list(column) for column in zip(*found)]
+
+    return tables
+
+# Finds if tables loaded from CACHE_FILE are the
+# ones makeTables would make now: the same version
+# and seeds, and masks, magics, shifts and attack
+# tables for every square.
+#
+# Parameters:
+#   tables - (anything read from the file)
+# Returns:
+#   valid  - Boolean
+def isValidTables(tables):
+    if not isinstance(tables, dict):
+        return False
+    if tables.get("version") != CACHE_VERSION or tables.get("seeds") != SEEDS:
+        return False
+
+    for name in ["rook", "bishop"]:
+        columns = tables.get(name)
+        if not isinstance(columns, list) or len(columns) != 4:
+            return False
+        for column in columns:
+            if not isinstance(column, list) or len(column) != SIZE*SIZE:
+                return False
+
+    return True
+
+# Loads the tables from CACHE_FILE, or makes them
+# and saves them there if the file is missing, out
+# of date or can't be read.
+#
+# Returns:
+#   tables - {}
+def loadTables():
+    # Anything wrong with the file only means the
+    # tables are made again
+    try:
+        with open(CACHE_FILE) as cache:
+            tables = json.load(cache)
+        if isValidTables(tables):
+            return tables
+    except Exception:
+        pass
+
+    tables = makeTables()
+
+    # Write to a temporary file first so another process
+    # never loads a half written cache
+    try:
+        temporary = CACHE_FILE + "." + str(os.getpid())
+        with open(temporary, "w") as cache:
+            json.dump(tables, cache)
+        os.replace(temporary, CACHE_FILE)
+    except OSError:
+        pass
+
+    return tables
@@ -0,0 +1,358 @@
+## DeepYellowJ - Version 0.1 (c) 2016 Ahmad Nazeri
+#    MoveGenerator - movegenerator.py
+#
+# This file finds the moves in a position. It
+# follows all of the rules: castling, en passant,
+# promotion, and (for legal moves) not leaving
+# one's own King in check.
+#
+# The moves are generators, so a move is only
+# made when it is asked for. A search that stops
+# after the first few moves never pays for the rest.
+#
+# A move is a 16-bit number:
+#   bits  0-5  - square moved from (current)
+#   bits  6-11 - square moved to (new)
+#   bits 12-15 - flags (see below)
+# which is the same number the transposition
+# table keeps as a position's best move.
+
+# Import the bitboard helpers and attack tables
+from bitboard import WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, PIECE_NAMES, \
+                     WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE, squaresOf
+from attacks import KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, rookAttacks, bishopAttacks
+from squares import SQUARE_NAMES
+
+# Board Size
+SIZE = 8
+
+# Move flags
+NORMAL = 0
+DOUBLE_PUSH = 1
+CASTLE = 2
+EN_PASSANT = 3
+PROMOTE_KNIGHT = 4
+PROMOTE_BISHOP = 5
+PROMOTE_ROOK = 6
+PROMOTE_QUEEN = 7
+
+# Promotions, best first. The promoted piece's
+# type is the flag - 3 (KNIGHT ... QUEEN).
+PROMOTIONS = [PROMOTE_QUEEN << 12, PROMOTE_KNIGHT << 12, PROMOTE_ROOK << 12, PROMOTE_BISHOP << 12]
+
+# Rows a Pawn promotes on / moves two spaces from
+LAST_ROWS = 0xFF000000000000FF
+THIRD_ROWS = [0x0000000000FF0000, 0x0000FF0000000000]
+
+# Squares that must be empty / not attacked to castle, and
+# the square the Rook has to be on
+# (rights, King from, King to, empty, not attacked, Rook)
+CASTLES = [[(WHITE_KINGSIDE, 4, 6, 0x60, [4, 5], 7), \
+            (WHITE_QUEENSIDE, 4, 2, 0x0E, [4, 3], 0)], \
+           [(BLACK_KINGSIDE, 60, 62, 0x60 << 56, [60, 61], 63), \
+            (BLACK_QUEENSIDE, 60, 58, 0x0E << 56, [60, 59], 56)]]
+
+# Makes a move.
+#
+# Parameters:
+#   current - int
+#   new     - int
+#   flags   - int (=NORMAL)
+# Returns:
+#   move    - int
+def makeMoveCode(current, new, flags=NORMAL):
+    return current | new << 6 | flags << 12
+
+# Returns the square a move is from.
+#
+# Parameters:
+#   move    - int
+# Returns:
+#   current - int
+def moveCurrent(move):
+    return move & 63
+
+# Returns the square a move is to.
+#
+# Parameters:
+#   move - int
+# Returns:
+#   new  - int
+def moveNew(move):
+    return (move >> 6) & 63
+
+# Returns the flags of a move.
+#
+# Parameters:
+#   move  - int
+# Returns:
+#   flags - int
+def moveFlags(move):
+    return move >> 12
+
+# Returns a move written out, for example "E2E4"
+# or "E7E8Q" for a promotion.
+#
+# Parameters:
+#   move - int
+# Returns:
+#   name - String
+def moveName(move):
+    name = SQUARE_NAMES[move & 63] + SQUARE_NAMES[(move >> 6) & 63]
+
+    if move >> 12 >= PROMOTE_KNIGHT:
+        name = name + PIECE_NAMES[(move >> 12) - 3]
+
+    return name
+
+# Finds if a square is attacked by a color.
+#
+# Parameters:
+#   board    - Board
+#   square   - int
+#   color    - int (WHITE or BLACK)
+# Returns:
+#   attacked - Boolean
+def isSquareAttacked(board, square, color):
+    pieces = board.getPieceBitboards()
+    occupied = board.getOccupancy()
+    offset = 6*color
+
+    if PAWN_ATTACKS[1-color][square] & pieces[offset+PAWN]:
+        return True
+    if KNIGHT_ATTACKS[square] & pieces[offset+KNIGHT]:
+        return True
+    if KING_ATTACKS[square] & pieces[offset+KING]:
+        return True
+    if bishopAttacks(square, occupied) & (pieces[offset+BISHOP] | pieces[offset+QUEEN]):
+        return True
+    if rookAttacks(square, occupied) & (pieces[offset+ROOK] | pieces[offset+QUEEN]):
+        return True
+
+    return False
+
+# Finds if a color's King is in check.
+#
+# Parameters:
+#   board   - Board
+#   color   - int (WHITE or BLACK)
+# Returns:
+#   inCheck - Boolean
+def isInCheck(board, color):
+    king = board.getPieceBitboards()[6*color+KING]
+
+    # Positions set up without a King are never in check
+    if not king:
+        return False
+
+    return isSquareAttacked(board, king.bit_length()-1, 1-color)
+
+# Goes through the moves of the side to move that
+# take a piece or promote a Pawn, without checking if
+# the King is left in check. These are the moves a
+# quiescence search looks at.
+#
+# Parameters:
+#   board - Board
+# Returns:
+#   move  - int (generator)
+def captureMoves(board):
+    us = board.getSideIndex()
+    them = 1 - us
+    pieces = board.getPieceBitboards()
+    colors = board.getColorBitboards()
+    occupied = colors[WHITE] | colors[BLACK]
+    opponent = colors[them]
+    offset = 6*us
+
+    # Pawns moving forward onto the last row
+    pawns = pieces[offset+PAWN]
+    if us == WHITE:
+        forward = SIZE
+        single = (pawns << SIZE) & ~occupied & LAST_ROWS
+    else:
+        forward = -SIZE
+        single = (pawns >> SIZE) & ~occupied & LAST_ROWS
+
+    for new in squaresOf(single):
+        for promotion in PROMOTIONS:
+            yield (new - forward) | new << 6 | promotion
+
+    enPassant = board.getEnPassant()
+    for current in squaresOf(pawns):
+        attack = PAWN_ATTACKS[us][current]
+        for new in squaresOf(attack & opponent):
+            if (1 << new) & LAST_ROWS:
+                for promotion in PROMOTIONS:
+                    yield current | new << 6 | promotion
+            else:
+                yield current | new << 6
+        if enPassant != None and attack & (1 << enPassant):
+            yield current | enPassant << 6 | EN_PASSANT << 12
+
+    # Pieces
+    for current in squaresOf(pieces[offset+KNIGHT]):
+        for new in squaresOf(KNIGHT_ATTACKS[current] & opponent):
+            yield current | new << 6
+
+    for current in squaresOf(pieces[offset+BISHOP]):
+        for new in squaresOf(bishopAttacks(current, occupied) & opponent):
+            yield current | new << 6
+
+    for current in squaresOf(pieces[offset+ROOK]):
+        for new in squaresOf(rookAttacks(current, occupied) & opponent):
+            yield current | new << 6
+
+    for current in squaresOf(pieces[offset+QUEEN]):
+        attack = rookAttacks(current, occupied) | bishopAttacks(current, occupied)
+        for new in squaresOf(attack & opponent):
+            yield current | new << 6
+
+    for current in squaresOf(pieces[offset+KING]):
+        for new in squaresOf(KING_ATTACKS[current] & opponent):
+            yield current | new << 6
+
+# Goes through the moves of the side to move that
+# don't take a piece or promote (including castling),
+# without checking if the King is left in check.
+# Castling is only given if the King doesn't pass
+# through check.
+#
+# Parameters:
+#   board - Board
+# Returns:
+#   move  - int (generator)
+def quietMoves(board):
+    us = board.getSideIndex()
+    them = 1 - us
+    pieces = board.getPieceBitboards()
+    colors = board.getColorBitboards()
+    occupied = colors[WHITE] | colors[BLACK]
+    empty = ~occupied
+    offset = 6*us
+
+    # Pawn moves, found for all Pawns at once
+    pawns = pieces[offset+PAWN]
+    if us == WHITE:
+        forward = SIZE
+        single = (pawns << SIZE) & empty
+        double = ((single & THIRD_ROWS[WHITE]) << SIZE) & empty
+    else:
+        forward = -SIZE
+        single = (pawns >> SIZE) & empty
+        double = ((single & THIRD_ROWS[BLACK]) >> SIZE) & empty
+
+    for new in squaresOf(single & ~LAST_ROWS):
+        yield (new - forward) | new << 6
+
+    for new in squaresOf(double):
+        yield (new - 2*forward) | new << 6 | DOUBLE_PUSH << 12
+
+    # Pieces
+    for current in squaresOf(pieces[offset+KNIGHT]):
+        for new in squaresOf(KNIGHT_ATTACKS[current] & empty):
+            yield current | new << 6
+
+    for current in squaresOf(pieces[offset+BISHOP]):
+        for new in squaresOf(bishopAttacks(current, occupied) & empty):
+            yield current | new << 6
+
+    for current in squaresOf(pieces[offset+ROOK]):
+        for new in squaresOf(rookAttacks(current, occupied) & empty):
+            yield current | new << 6
+
+    for current in squaresOf(pieces[offset+QUEEN]):
+        attack = rookAttacks(current, occupied) | bishopAttacks(current, occupied)
+        for new in squaresOf(attack & empty):
+            yield current | new << 6
+
+    for current in squaresOf(pieces[offset+KING]):
+        for new in squaresOf(KING_ATTACKS[current] & empty):
+            yield current | new << 6
+
+    # Castling, only with the King and Rook on their squares
+    # (the rights alone could have been given without them)
+    castling = board.getCastlingRights()
+    for rights, current, new, between, passing, rook in CASTLES[us]:
+        if castling & rights and not occupied & between and \
+           pieces[offset+KING] >> current & 1 and pieces[offset+ROOK] >> rook & 1:
+            for square in passing:
+                if isSquareAttacked(board, square, them):
+                    break
+            else:
+                yield current | new << 6 | CASTLE << 12
+
+# Goes through the moves of the side to move that
+# follow how the pieces move, without checking if
+# the King is left in check: the captures and
+# promotions first, then the quiet moves.
+#
+# Parameters:
+#   board - Board
+# Returns:
+#   move  - int (generator)
+def pseudoLegalMoves(board):
+    yield from captureMoves(board)
+    yield from quietMoves(board)
+
+# Finds if a move (for example one from the
+# transposition table) can be made by the side to
+# move, not counting whether it leaves the King in
+# check. Pawn moves and special moves are checked
+# against the generator, the rest with the attack
+# tables.
+#
+# Parameters:
+#   board  - Board
+#   move   - int
+# Returns:
+#   pseudoLegal - Boolean
+def isPseudoLegal(board, move):
+    current = move & 63
+    new = (move >> 6) & 63
+    us = board.getSideIndex()
+    piece = board.getSquares()[current]
+    colors = board.getColorBitboards()
+
+    if piece == None or piece//6 != us or colors[us] & (1 << new):
+        return False
+
+    kind = piece%6
+    if kind == PAWN or move >> 12 != NORMAL:
+        for generated in pseudoLegalMoves(board):
+            if generated == move:
+                return True
+        return False
+
+    occupied = colors[WHITE] | colors[BLACK]
+    if kind == KNIGHT:
+        attack = KNIGHT_ATTACKS[current]
+    elif kind == BISHOP:
+        attack = bishopAttacks(current, occupied)
+    elif kind == ROOK:
+        attack = rookAttacks(current, occupied)
+    elif kind == QUEEN:
+        attack = rookAttacks(current, occupied) | bishopAttacks(current, occupied)
+    else:
+        attack = KING_ATTACKS[current]
+
+    return attack & (1 << new) != 0
+
+# Goes through the legal moves of the side to move.
+# Each move is made and taken back to check that it
+# doesn't leave the King in check.
+#
+# Parameters:
+#   board - Board
+# Returns:
+#   move  - int (generator)
+def legalMoves(board):
+    us = board.getSideIndex()
+
+    for move in pseudoLegalMoves(board):
+        undo = board.makeMove(move)
+        inCheck = isInCheck(board, us)
+        board.unmakeMove(undo)
+
+        if not inCheck:
+            yield move
@@ -0,0 +1,167 @@
+## DeepYellowJ - Version 0.1 (c) 2016 Ahmad Nazeri
+#    MoveOrdering - moveordering.py
+#
+# This file keeps what is needed to put moves in the
+# order the search tries them (see movepicker.py).
+# Alpha-beta skips the most moves when the best move
+# is tried first, so the order is:
+#   1) the move from the transposition table
+#   2) captures and promotions, most valuable piece
+#      taken by the least valuable piece first (MVV-LVA)
+#   3) killer moves, quiet moves that caused a cutoff
+#      at the same ply elsewhere in the tree
+#   4) other quiet moves, by the history table (how
+#      often the same move caused cutoffs before)
+#   5) captures that look like they lose material
+#
+# It also counts how often the first move tried
+# caused the cutoff, and in which stage of the
+# MovePicker, which shows how good the order is.
+
+# Import classes from other files
+from bitboard import PAWN, KING
+from movegenerator import EN_PASSANT, PROMOTE_KNIGHT
+
+# Board Size
+SIZE = 8
+
+# History scores are halved when one gets this high
+HISTORY_MAX = 1 << 20
+
+# Killer moves kept for each ply
+KILLER_SLOTS = 2
+
+# Stages of the MovePicker, cutoffs are counted for each
+STAGES = 5
+
+class MoveOrdering:
+    # Constructor for MoveOrdering.
+    #
+    # Parameters:
+    #   maxPly - int (deepest ply killers are kept for)
+    def __init__(self, maxPly):
+        self._maxPly = maxPly
+        self._killers = [[0]*KILLER_SLOTS for i in range(maxPly+1)]
+        self._history = [[0]*(SIZE**4) for i in range(2)]
+        self._cutoffs = 0
+        self._firstMoveCutoffs = 0
+        self._stageCutoffs = [0]*STAGES
+
+    # Gets ready for a new search. Killers only mean
+    # something in the tree they were found in, history
+    # is kept but counts for less.
+    def newSearch(self):
+        self._killers = [[0]*KILLER_SLOTS for i in range(self._maxPly+1)]
+        for side in range(2):
+            self._history[side] = [score >> 1 for score in self._history[side]]
+
+    # Finds if a move takes a piece or promotes.
+    #
+    # Parameters:
+    #   board   - Board
+    #   move    - int
+    # Returns:
+    #   capture - Boolean
+    def isCapture(self, board, move):
+        return board.getSquares()[(move >> 6) & 63] != None or (move >> 12) == EN_PASSANT or \
+               (move >> 12) >= PROMOTE_KNIGHT
+
+    # Scores a capture or promotion by MVV-LVA: the
+    # kind of piece taken (Pawn ... Queen) comes first,
+    # then the least valuable piece taking it.
+    #
+    # Parameters:
+    #   board - Board
+    #   move  - int
+    # Returns:
+    #   score - int
+    def captureScore(self, board, move):
+        squares = board.getSquares()
+        flags = move >> 12
+        victim = squares[(move >> 6) & 63]
+
+        if victim != None:
+            victim = victim%6
+        elif flags == EN_PASSANT:
+            victim = PAWN
+        else:
+            victim = -1
+
+        score = 8*(victim+1) + KING - squares[move & 63]%6
+
+        # A promotion counts as taking the new piece too
+        if flags >= PROMOTE_KNIGHT:
+            score = score + 8*(flags-3)
+
+        return score
+
+    # Gets the killer moves of a ply, best first
+    # (0 if there isn't one).
+    #
+    # Parameters:
+    #   ply     - int
+    # Returns:
+    #   killers - [int]
+    def getKillers(self, ply):
+        return self._killers[ply]
+
+    # Gets the history table of a side, indexed by the
+    # squares of a move (move & 0xFFF). The list must
+    # not be changed.
+    #
+    # Parameters:
+    #   side    - int (WHITE or BLACK)
+    # Returns:
+    #   history - [int]
+    def getHistory(self, side):
+        return self._history[side]
+
+    # Remembers a quiet move that caused a cutoff, as
+    # a killer for its ply and in the history table.
+    #
+    # Parameters:
+    #   move  - int
+    #   side  - int (WHITE or BLACK)
+    #   depth - int
+    #   ply   - int
+    def addCutoff(self, move, side, depth, ply):
+        killers = self._killers[ply]
+        if killers[0] != move:
+            killers[1:] = killers[:-1]
+            killers[0] = move
+
+        history = self._history[side]
+        history[move & 0xFFF] = history[move & 0xFFF] + depth*depth
+        if history[move & 0xFFF] > HISTORY_MAX:
+            self._history[side] = [score >> 1 for score in history]
+
+    # Counts a cutoff, whether it was caused by the
+    # first move tried, and the stage the move was in.
+    #
+    # Parameters:
+    #   firstMove - Boolean
+    #   stage     - int (see movepicker.py)
+    def countCutoff(self, firstMove, stage):
+        self._cutoffs = self._cutoffs + 1
+        if firstMove:
+            self._firstMoveCutoffs = self._firstMoveCutoffs + 1
+        self._stageCutoffs[stage] = self._stageCutoffs[stage] + 1
+
+    # Returns how well the moves have been ordered.
+    #
+    # Returns:
+    #   statistics - {}
+    def getStatistics(self):
+        if self._cutoffs:
+            firstMoveRate = self._firstMoveCutoffs/self._cutoffs
+        else:
+            firstMoveRate = 0.0
+
+        return {"cutoffs": self._cutoffs, "firstMoveCutoffs": self._firstMoveCutoffs, \
+                "firstMoveRate": firstMoveRate, "stageCutoffs": list(self._stageCutoffs)}
+
+    # Resets the cutoff counts.
+    def clearStatistics(self):
+        self._cutoffs = 0
+        self._firstMoveCutoffs = 0
+        self._stageCutoffs = [0]*STAGES
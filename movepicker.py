@@ -0,0 +1,130 @@
+## DeepYellowJ - Version 0.1 (c) 2016 Ahmad Nazeri
+#    MovePicker - movepicker.py
+#
+# This file gives the search its moves in stages:
+#   HASH_MOVE     - the move from the transposition table
+#   GOOD_CAPTURES - captures that don't lose material,
+#                   and promotions, by MVV-LVA
+#   KILLERS       - killer moves for the ply
+#   QUIETS        - the other quiet moves, by history
+#   BAD_CAPTURES  - a piece taking a less valuable one
+#                   that is defended
+# Each stage is only generated once the ones before it
+# are used up, so a node cut off by the hash move or a
+# capture never generates its quiet moves.
+#
+# The moves are pseudo-legal (see movegenerator.py),
+# the search checks the King isn't left in check.
+
+# Import classes from other files
+from bitboard import KING, PIECE_VALUES
+from movegenerator import EN_PASSANT, PROMOTE_KNIGHT, captureMoves, quietMoves, \
+                          isPseudoLegal, isSquareAttacked
+
+# Stages
+HASH_MOVE = 0
+GOOD_CAPTURES = 1
+KILLERS = 2
+QUIETS = 3
+BAD_CAPTURES = 4
+
+class MovePicker:
+    # Constructor for MovePicker.
+    #
+    # Parameters:
+    #   board        - Board
+    #   ordering     - MoveOrdering
+    #   hashMove     - int (0 if none)
+    #   ply          - int
+    #   capturesOnly - Boolean (=False, only captures and promotions)
+    #   attackMaps   - AttackMaps (=None, maps of the position, used
+    #                  to find which captures are defended)
+    def __init__(self, board, ordering, hashMove, ply, capturesOnly=False, attackMaps=None):
+        self._board = board
+        self._ordering = ordering
+        self._hashMove = hashMove
+        self._ply = ply
+        self._capturesOnly = capturesOnly
+        self._attackMaps = attackMaps
+        self._stage = HASH_MOVE
+
+    # Goes through the moves, stage by stage.
+    #
+    # Returns:
+    #   move - int (generator)
+    def moves(self):
+        board = self._board
+        ordering = self._ordering
+        hashMove = self._hashMove
+
+        # The table's move could be from another position
+        # with the same index, so it is checked first
+        if hashMove and isPseudoLegal(board, hashMove) and \
+           (not self._capturesOnly or ordering.isCapture(board, hashMove)):
+            self._stage = HASH_MOVE
+            yield hashMove
+
+        self._stage = GOOD_CAPTURES
+        captures = [move for move in captureMoves(board) if move != hashMove]
+        captures.sort(key=lambda move: ordering.captureScore(board, move), reverse=True)
+
+        badCaptures = []
+        for move in captures:
+            if self.isBadCapture(move):
+                badCaptures.append(move)
+            else:
+                yield move
+
+        if not self._capturesOnly:
+            self._stage = KILLERS
+            killers = []
+            for move in ordering.getKillers(self._ply):
+                if move and move != hashMove and not ordering.isCapture(board, move) and \
+                   isPseudoLegal(board, move):
+                    killers.append(move)
+                    yield move
+
+            self._stage = QUIETS
+            quiets = [move for move in quietMoves(board) if move != hashMove and move not in killers]
+            history = ordering.getHistory(board.getSideIndex())
+            quiets.sort(key=lambda move: history[move & 0xFFF], reverse=True)
+
+            for move in quiets:
+                yield move
+
+        self._stage = BAD_CAPTURES
+        for move in badCaptures:
+            yield move
+
+    # Finds if a capture is likely to lose material:
+    # a piece takes a less valuable piece that is
+    # defended. Promotions are never bad.
+    #
+    # Parameters:
+    #   move - int
+    # Returns:
+    #   bad  - Boolean
+    def isBadCapture(self, move):
+        board = self._board
+        flags = move >> 12
+
+        if flags >= PROMOTE_KNIGHT or flags == EN_PASSANT:
+            return False
+
+        squares = board.getSquares()
+        new = (move >> 6) & 63
+        attacker = squares[move & 63]%6
+
+        if attacker == KING or PIECE_VALUES[attacker] <= PIECE_VALUES[squares[new]%6]:
+            return False
+
+        if self._attackMaps != None:
+            return self._attackMaps.isAttacked(new, 1 - board.getSideIndex())
+        return isSquareAttacked(board, new, 1 - board.getSideIndex())
+
+    # Returns the stage of the last move given.
+    #
+    # Returns:
+    #   stage - int
+    def getStage(self):
+        return self._stage
@@ -0,0 +1,186 @@
+## DeepYellowJ - Version 0.1 (c) 2016 Ahmad Nazeri
+#    PawnStructure - pawnstructure.py
+#
+# This file scores the Pawns:
+#   doubled  - more than one Pawn of a side on a column
+#   isolated - a Pawn with no Pawns of its side on the
+#              columns beside it
+#   passed   - a Pawn with no opponent's Pawns in front
+#              of it on its column or the ones beside
+#              it, worth more the further it has gone
+#
+# The Pawns hardly ever change from one position to
+# the next, so the scores are kept in a PawnTable,
+# found by the pawn hash (the Zobrist keys of the
+# Pawns only, see Board.getPawnHash). The passed Pawns
+# are kept with the score so other terms can use them.
+
+# Import classes from other files
+from bitboard import WHITE, BLACK, PAWN, FULL, popCount, squaresOf, tableEntries
+
+# Import the array used to hold the table
+from array import array
+
+# Board Size
+SIZE = 8
+
+# Every square of the A column
+COLUMN_A = 0x0101010101010101
+
+# Centipawns taken off for each doubled or isolated Pawn
+DOUBLED_PENALTY = 10
+ISOLATED_PENALTY = 15
+
+# Centipawns for a passed Pawn, by how many rows it
+# has gone (from its side of the board)
+PASSED_BONUS = [0, 5, 10, 20, 35, 60, 100, 0]
+
+# Kilobytes used by a PawnTable if no size is given
+PAWN_TABLE_KB = 256
+
+# Bytes in each table entry (key, two passed masks, score)
+ENTRY_BYTES = 28
+
+# Makes the mask of squares in front of a Pawn, on
+# its column and the ones beside it. If none of the
+# opponent's Pawns are on them the Pawn is passed.
+#
+# Parameters:
+#   side   - int (WHITE or BLACK)
+#   square - int
+# Returns:
+#   mask   - int
+def passedMask(side, square):
+    row = square//SIZE
+    column = square%SIZE
+    mask = 0
+
+    for otherColumn in range(max(column-1, 0), min(column+2, SIZE)):
+        for otherRow in range(SIZE):
+            if (side == WHITE and otherRow > row) or (side == BLACK and otherRow < row):
+                mask |= 1 << (otherRow*SIZE + otherColumn)
+
+    return mask
+
+# PASSED_MASKS[side][square]
+PASSED_MASKS = [[passedMask(side, square) for square in range(SIZE*SIZE)] for side in range(2)]
+
+# Finds the columns that have a Pawn, as one bit for
+# each column (A is bit 0).
+#
+# Parameters:
+#   pawns   - int (bitboard)
+# Returns:
+#   columns - int
+def pawnColumns(pawns):
+    pawns |= pawns >> 32
+    pawns |= pawns >> 16
+    pawns |= pawns >> 8
+    return pawns & 0xFF
+
+# Scores the doubled and isolated Pawns of one side
+# (how many there are, times their penalties).
+#
+# Parameters:
+#   pawns   - int (bitboard)
+# Returns:
+#   penalty - int
+def pawnPenalty(pawns):
+    columns = pawnColumns(pawns)
+    doubled = popCount(pawns) - popCount(columns)
+
+    # Columns with no Pawn of the side beside them
+    isolatedColumns = columns & ~((columns << 1) | (columns >> 1))
+    isolated = popCount(pawns & ((isolatedColumns*COLUMN_A) & FULL))
+
+    return DOUBLED_PENALTY*doubled + ISOLATED_PENALTY*isolated
+
+# Scores the Pawns of a position.
+#
+# Parameters:
+#   whitePawns - int (bitboard)
+#   blackPawns - int (bitboard)
+# Returns:
+#   (score, whitePassed, blackPassed) - (int, int, int) (score for White,
+#                                       bitboards of the passed Pawns)
+def evaluatePawns(whitePawns, blackPawns):
+    score = pawnPenalty(blackPawns) - pawnPenalty(whitePawns)
+    whitePassed = 0
+    blackPassed = 0
+
+    for square in squaresOf(whitePawns):
+        if not PASSED_MASKS[WHITE][square] & blackPawns:
+            whitePassed |= 1 << square
+            score = score + PASSED_BONUS[square//SIZE]
+
+    for square in squaresOf(blackPawns):
+        if not PASSED_MASKS[BLACK][square] & whitePawns:
+            blackPassed |= 1 << square
+            score = score - PASSED_BONUS[SIZE-1 - square//SIZE]
+
+    return score, whitePassed, blackPassed
+
+class PawnTable:
+    # Constructor for PawnTable. Each entry keeps the
+    # pawn hash, the passed Pawns of each side and the
+    # score. An entry is always replaced. With no Pawns
+    # the hash is 0, which matches an empty entry, and
+    # that is right: no Pawns score 0.
+    #
+    # Parameters:
+    #   sizeKB - int (=PAWN_TABLE_KB, kilobytes to use)
+    def __init__(self, sizeKB=PAWN_TABLE_KB):
+        # Use the largest power of two entries that fits
+        entries = tableEntries(sizeKB*1024, ENTRY_BYTES)
+
+        self._mask = entries - 1
+        self._keys = array("Q", [0]) * entries
+        self._passed = array("Q", [0]) * (2*entries)
+        self._scores = array("i", [0]) * entries
+        self._hits = 0
+        self._misses = 0
+
+    # Finds the Pawn score of a position, from the
+    # table if it is there.
+    #
+    # Parameters:
+    #   board - Board
+    # Returns:
+    #   (score, whitePassed, blackPassed) - (int, int, int) (see evaluatePawns)
+    def evaluate(self, board):
+        pawnHash = board.getPawnHash()
+        index = pawnHash & self._mask
+
+        if self._keys[index] == pawnHash:
+            self._hits = self._hits + 1
+            return self._scores[index], self._passed[2*index], self._passed[2*index+1]
+        self._misses = self._misses + 1
+
+        pieces = board.getPieceBitboards()
+        score, whitePassed, blackPassed = evaluatePawns(pieces[6*WHITE + PAWN], pieces[6*BLACK + PAWN])
+
+        self._keys[index] = pawnHash
+        self._scores[index] = score
+        self._passed[2*index] = whitePassed
+        self._passed[2*index+1] = blackPassed
+
+        return score, whitePassed, blackPassed
+
+    # Returns how often the Pawn score was found in
+    # the table.
+    #
+    # Returns:
+    #   statistics - {}
+    def getStatistics(self):
+        probes = self._hits + self._misses
+        if probes:
+            hitRate = self._hits/probes
+        else:
+            hitRate = 0.0
+
+        return {"hits": self._hits, "misses": self._misses, "hitRate": hitRate}
+
+    # Resets the hit and miss counts.
+    def clearStatistics(self):
+        self._hits = 0
+        self._misses = 0
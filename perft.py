@@ -0,0 +1,302 @@
+## DeepYellowJ - Version 0.1 (c) 2016 Ahmad Nazeri
+#    Perft - perft.py
+#
+# This file counts the positions reached after a
+# number of moves (perft). The counts for well known
+# positions are published, so it checks that the move
+# generator follows the rules, and how fast it runs.
+#
+# Usage:
+#   python perft.py DEPTH [FEN] [--divide] [--hash MB] [--processes N]
+#   python perft.py [DEPTH] --verify [--hash MB]
+#
+#   --verify      checks the published counts of the
+#                 positions in KNOWN_COUNTS, up to DEPTH
+#                 (VERIFY_DEPTH if not given)
+#   --divide      prints the count under each first move
+#   --hash MB     remembers counts of positions already
+#                 seen (same hash and depth)
+#   --processes N splits the first moves between N
+#                 processes
+
+# Import classes from other files
+from board import Board, START_FEN
+from movegenerator import moveName
+from bitboard import tableEntries
+
+# Import what is needed to time and split the work
+import argparse
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+# Bytes in each cache entry (hash and data)
+ENTRY_BYTES = 16
+
+# Most moves checked by --verify if no depth is given,
+# deeper takes minutes
+VERIFY_DEPTH = 3
+
+# Published counts of well known positions, for
+# depths 1, 2, 3, ... (from the Chess Programming Wiki)
+KNOWN_COUNTS = [("Start", START_FEN, [20, 400, 8902, 197281, 4865609]), \
+                ("Kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", \
+                 [48, 2039, 97862, 4085603]), \
+                ("Position 3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", \
+                 [14, 191, 2812, 43238, 674624]), \
+                ("Position 4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", \
+                 [6, 264, 9467, 422333]), \
+                ("Position 5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", \
+                 [44, 1486, 62379, 2103487]), \
+                ("Position 6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10", \
+                 [46, 2079, 89890, 3894594])]
+
+class PerftCache:
+    # Constructor for PerftCache. Each entry is two
+    # numbers, the hash of the position and the count
+    # packed with its depth (depth | count << 8). An
+    # entry is always replaced.
+    #
+    # Parameters:
+    #   sizeMB - int (megabytes to use)
+    def __init__(self, sizeMB):
+        # Use the largest power of two entries that fits
+        entries = tableEntries(sizeMB*1024*1024, ENTRY_BYTES)
+
+        self._mask = entries - 1
+        self._table = array("Q", [0]) * (2*entries)
+        self._hits = 0
+
+    # Looks up the count of a position.
+    #
+    # Parameters:
+    #   positionHash - int
+    #   depth        - int
+    # Returns:
+    #   count        - int (None if not found)
+    def probe(self, positionHash, depth):
+        index = 2*(positionHash & self._mask)
+        data = self._table[index+1]
+
+        if (data & 0xFF) == depth and self._table[index] == positionHash:
+            self._hits = self._hits + 1
+            return data >> 8
+        return None
+
+    # Stores the count of a position.
+    #
+    # Parameters:
+    #   positionHash - int
+    #   depth        - int
+    #   count        - int
+    def store(self, positionHash, depth, count):
+        index = 2*(positionHash & self._mask)
+        self._table[index] = positionHash
+        self._table[index+1] = depth | count << 8
+
+    # Returns the number of counts found in the cache.
+    #
+    # Returns:
+    #   hits - int
+    def getHits(self):
+        return self._hits
+
+# Counts the positions reached after depth moves.
+# At depth 1 the moves are only counted, not made.
+#
+# Parameters:
+#   board - Board
+#   depth - int
+#   cache - PerftCache (=None)
+# Returns:
+#   nodes - int
+def perft(board, depth, cache=None):
+    if depth == 0:
+        return 1
+
+    if cache != None:
+        nodes = cache.probe(board.getHash(), depth)
+        if nodes != None:
+            return nodes
+
+    if depth == 1:
+        nodes = sum(1 for move in board.generateLegalMoves())
+    else:
+        nodes = 0
+        for move in board.generateLegalMoves():
+            undo = board.makeMove(move)
+            nodes = nodes + perft(board, depth-1, cache)
+            board.unmakeMove(undo)
+
+    if cache != None:
+        cache.store(board.getHash(), depth, nodes)
+
+    return nodes
+
+# Counts the positions under each first move.
+#
+# Parameters:
+#   board  - Board
+#   depth  - int
+#   cache  - PerftCache (=None)
+# Returns:
+#   counts - [(int, int)] (move and count)
+def divide(board, depth, cache=None):
+    counts = []
+
+    for move in list(board.generateLegalMoves()):
+        undo = board.makeMove(move)
+        counts.append((move, perft(board, depth-1, cache)))
+        board.unmakeMove(undo)
+
+    return counts
+
+# Counts the positions under one first move. This
+# runs in another process, so the position is given
+# as a FEN string and each process makes its own
+# board and cache.
+#
+# Parameters:
+#   fen    - String
+#   move   - int
+#   depth  - int
+#   hashMB - int (0 for no cache)
+# Returns:
+#   (count, hits) - (int, int)
+def perftMove(fen, move, depth, hashMB):
+    board = Board()
+    board.loadFen(fen)
+
+    cache = None
+    if hashMB:
+        cache = PerftCache(hashMB)
+
+    board.makeMove(move)
+    count = perft(board, depth-1, cache)
+
+    if cache != None:
+        return count, cache.getHits()
+    return count, 0
+
+# Counts the positions under each first move,
+# splitting the first moves between processes.
+#
+# Parameters:
+#   fen       - String
+#   depth     - int
+#   processes - int
+#   hashMB    - int (0 for no cache)
+# Returns:
+#   (counts, hits) - ([(int, int)], int)
+def parallelDivide(fen, depth, processes, hashMB):
+    board = Board()
+    board.loadFen(fen)
+    moves = list(board.generateLegalMoves())
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        results = list(pool.map(perftMove, [fen]*len(moves), moves, \
+                                [depth]*len(moves), [hashMB]*len(moves)))
+
+    counts = [(moves[i], results[i][0]) for i in range(len(moves))]
+    return counts, sum([hits for count, hits in results])
+
+# Checks perft against the published counts in
+# KNOWN_COUNTS, printing each one.
+#
+# Parameters:
+#   depth  - int (most moves to check)
+#   hashMB - int (=0, megabytes for a cache, 0 for none)
+# Returns:
+#   passed - Boolean
+def verify(depth, hashMB=0):
+    board = Board()
+    passed = True
+
+    for name, fen, counts in KNOWN_COUNTS:
+        board.loadFen(fen)
+        cache = None
+        if hashMB:
+            cache = PerftCache(hashMB)
+
+        for i in range(min(depth, len(counts))):
+            start = perf_counter()
+            nodes = perft(board, i+1, cache)
+            seconds = perf_counter() - start
+
+            if nodes == counts[i]:
+                result = "ok"
+            else:
+                result = "FAILED, expected " + str(counts[i])
+                passed = False
+            print("%s depth %d: %d (%.3f s) %s" % (name, i+1, nodes, seconds, result))
+
+    return passed
+
+# Reads the command line, runs perft and prints
+# the counts and nodes per second.
+def main():
+    parser = argparse.ArgumentParser(description="Counts the positions reached after DEPTH moves.")
+    parser.add_argument("depth", type=int, nargs="?")
+    parser.add_argument("fen", nargs="?", default=START_FEN, \
+                        help="position to start from (default: starting position)")
+    parser.add_argument("--divide", action="store_true", \
+                        help="print the count under each first move")
+    parser.add_argument("--hash", type=int, default=0, metavar="MB", \
+                        help="megabytes for a cache of counts (default: no cache)")
+    parser.add_argument("--processes", type=int, default=1, metavar="N", \
+                        help="processes to split the first moves between")
+    parser.add_argument("--verify", action="store_true", \
+                        help="check the published counts of well known positions")
+    arguments = parser.parse_args()
+
+    if arguments.verify:
+        if arguments.depth == None:
+            arguments.depth = VERIFY_DEPTH
+        if arguments.depth < 1:
+            parser.error("depth must be at least 1")
+        if not verify(arguments.depth, arguments.hash):
+            raise SystemExit(1)
+        return
+
+    if arguments.depth == None:
+        parser.error("the depth is needed")
+    if arguments.depth < 1:
+        parser.error("depth must be at least 1")
+
+    board = Board()
+    try:
+        board.loadFen(arguments.fen)
+    except (ValueError, KeyError) as error:
+        parser.error("bad FEN: " + str(error))
+    fen = board.getFen()
+
+    start = perf_counter()
+    hits = 0
+
+    if arguments.processes > 1:
+        counts, hits = parallelDivide(fen, arguments.depth, arguments.processes, arguments.hash)
+    else:
+        cache = None
+        if arguments.hash:
+            cache = PerftCache(arguments.hash)
+        counts = divide(board, arguments.depth, cache)
+        if cache != None:
+            hits = cache.getHits()
+
+    seconds = perf_counter() - start
+    nodes = sum([count for move, count in counts])
+
+    if arguments.divide:
+        for move, count in counts:
+            print(moveName(move) + ": " + str(count))
+        print()
+
+    print("Moves: " + str(len(counts)))
+    print("Nodes: " + str(nodes))
+    print("Time: %.3f s" % seconds)
+    print("NPS: " + str(int(nodes/max(seconds, 1e-9))))
+    if arguments.hash:
+        print("Cache hits: " + str(hits))
+
+if __name__ == "__main__":
+    main()
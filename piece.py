@@ -2,10 +2,22 @@
 #    Piece - piece.py
 #
 # This file is the object class for a piece.
-# The piece keeps track of name, color,
-# point value, and if it has been moved.
+# The piece keeps track of name, color and
+# point value. There are only 12 kinds of
+# pieces, so one Piece of each kind is made
+# (PIECES) and shared by every board.
+
+# Import the bitboard helpers
+from bitboard import COLORS, PIECE_NAMES, pieceIndex
+
+# Point value of each kind of piece
+POINT_VALUES = {"P": 1, "N": 3, "B": 3, "R": 5, "Q": 9, "K": 100}
 
 class Piece:
+    # Only these attributes are kept, so a Piece
+    # doesn't need a __dict__
+    __slots__ = ("_name", "_color", "_pointValue", "_index")
+
     # Constructor for Piece.
     #
     # Parameters:
@@ -16,25 +28,7 @@ class Piece:
         self._name = name
         self._color = color
         self._pointValue = pointValue
-        self._moved = False
-
-    # Change once the piece has moved
-    def changedMoved(self):
-        self._moved = True
-        
-    # Changes the name of piece
-    #
-    # Parameter:
-    #   name - String
-    def changeName(self, name):
-        self._name = name
-
-    # Changes the point value of the piece
-    #
-    # Parameters:
-    #   pointValue - int
-    def changePointValue(self, pointValue):
-        self._pointValue = pointValue
+        self._index = pieceIndex(name, color)
 
     ## USED TO RETURN PRIVATE VARIABLES
     # Returns the name of the piece
@@ -43,7 +37,7 @@ class Piece:
     #   self._name - String
     def getName(self):
         return self._name
-    
+
     # Returns the color of the piece:
     #
     # Returns:
@@ -52,14 +46,19 @@ class Piece:
         return self._color
 
     # Returns the point value of piece
-    # 
+    #
     # Returns:
     #   self._pointValue - int
     def getPointValue(self):
         return self._pointValue
 
-    # Returns whether piece has moved or not
-    # Returns: (boolean)
-    def getPieceMoved(self):
-        return self._moved
-        
+    # Returns the index of the piece's bitboard
+    # (see bitboard.py)
+    #
+    # Returns:
+    #   self._index - int
+    def getIndex(self):
+        return self._index
+
+# The 12 shared pieces, in bitboard order
+PIECES = [Piece(name, color, POINT_VALUES[name]) for color in COLORS for name in PIECE_NAMES]
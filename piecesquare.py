@@ -0,0 +1,97 @@
+## DeepYellowJ - Version 0.1 (c) 2016 Ahmad Nazeri
+#    PieceSquare - piecesquare.py
+#
+# This file loads the piece-square tables: how much
+# a piece is worth on each square, one table for the
+# middlegame and one for the endgame. The evaluator
+# blends the two by the game phase, worked out from
+# the pieces left (a Queen counts more than a Knight).
+#
+# The tables are read from PST_FILE so they can be
+# tuned without changing the code. Each table has the
+# 8th row first, as White sees the board. Black uses
+# the same tables turned over, and its values count
+# against White, so the lists here are indexed like
+# the bitboards (color*6 + piece) and give the score
+# for White.
+#
+# Board keeps the sums of the tables up to date as
+# pieces move (see board.py).
+
+# Import what is needed to load the tables
+import os
+import json
+from bitboard import WHITE, BLACK, PIECE_NAMES
+
+# Board Size
+SIZE = 8
+
+PST_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pst.json")
+
+# Value of each piece on each square, for White
+MIDDLEGAME = [[0]*(SIZE*SIZE) for i in range(2*6)]
+ENDGAME = [[0]*(SIZE*SIZE) for i in range(2*6)]
+
+# How much each piece counts towards the game phase
+PHASE = [0]*(2*6)
+
+# Game phase of the starting position
+phaseMax = 0
+
+# Reads one table from the file, as a list of
+# values by square (A1 = 0).
+#
+# Parameters:
+#   rows  - [[int]] (from the file, 8th row first)
+#   name  - String (for the error message)
+# Returns:
+#   table - [int]
+def readTable(rows, name):
+    if len(rows) != SIZE or any(len(row) != SIZE for row in rows):
+        raise ValueError("Piece-square table " + name + " needs 8 rows of 8")
+
+    table = [0]*(SIZE*SIZE)
+    for row in range(SIZE):
+        for column in range(SIZE):
+            table[(SIZE-1-row)*SIZE + column] = int(rows[row][column])
+    return table
+
+# Loads the tables from a file. The lists above are
+# changed in place, so boards set up before need to
+# be set up again (for example with loadFen).
+#
+# Parameters:
+#   fileName - String (=PST_FILE)
+def loadTables(fileName=PST_FILE):
+    global phaseMax
+
+    with open(fileName) as tableFile:
+        tables = json.load(tableFile)
+
+    for piece in range(6):
+        name = PIECE_NAMES[piece]
+        for phaseTables, stage in [(MIDDLEGAME, "middlegame"), (ENDGAME, "endgame")]:
+            table = readTable(tables[stage][name], stage + " " + name)
+
+            # Black's table is White's turned over
+            for square in range(SIZE*SIZE):
+                phaseTables[6*WHITE + piece][square] = table[square]
+                phaseTables[6*BLACK + piece][square ^ (SIZE*SIZE - SIZE)] = -table[square]
+
+        PHASE[6*WHITE + piece] = int(tables["phase"][name])
+        PHASE[6*BLACK + piece] = int(tables["phase"][name])
+
+    # 8 Pawns, 2 Knights, 2 Bishops, 2 Rooks, a Queen and a King each
+    phaseMax = 2*(8*PHASE[0] + 2*PHASE[1] + 2*PHASE[2] + 2*PHASE[3] + PHASE[4] + PHASE[5])
+    if phaseMax <= 0:
+        raise ValueError("The phase of the starting position has to be more than 0")
+
+# Returns the game phase of the starting position,
+# the most the evaluator counts.
+#
+# Returns:
+#   phaseMax - int
+def getPhaseMax():
+    return phaseMax
+
+loadTables()
@@ -15,11 +15,12 @@ class Player:
     #   color    - String
     #   computer - Boolean
     #   board    - Board
-    def __init__(self, color, computer, board):
+    #   moveTime - float (=None, seconds DeepYellowJ thinks each move)
+    def __init__(self, color, computer, board, moveTime=None):
         self._color = color
         self._computer = computer
         self._piecesTaken = []
-        self._AI = DeepYellowJ(color, board)
+        self._AI = DeepYellowJ(color, board, moveTime=moveTime)
 
     # Adds taken piece to self._piecesTaken.
     #
@@ -52,4 +53,9 @@ class Player:
     #   self._computer - Boolean
     def isComputer(self):
         return self._computer
+
+    # Ends DeepYellowJ's helper or worker processes,
+    # if it has any. Called when the game is over.
+    def close(self):
+        self._AI.close()
     
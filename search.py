@@ -0,0 +1,692 @@
+## DeepYellowJ - Version 0.1 (c) 2016 Ahmad Nazeri
+#    Search - search.py
+#
+# This file is the search used by DeepYellowJ to
+# look ahead. It is a negamax alpha-beta search: each
+# side picks the move that is best for itself, and
+# moves that can't change the result are not looked
+# at (the alpha-beta window). The search makes and
+# takes back moves on one Board (see board.makeMove)
+# instead of copying it.
+#
+# Results are kept in the transposition table, and
+# the move it has for a position is searched first
+# (see movepicker.py for the order of the rest).
+#
+# Two ways of searching less are used, each can be
+# turned off:
+#   null move pruning     - if passing the move still
+#                           fails high in a shallow search,
+#                           the position is cut off
+#   late move reductions  - quiet moves late in the order
+#                           are searched less deep first,
+#                           and again at full depth only if
+#                           they turn out better than alpha
+#
+# Near the leaves, two more ways of searching less are
+# used (also each can be turned off), with margins from
+# the evaluator:
+#   futility pruning      - with 1 or 2 moves left, quiet
+#                           moves are skipped if the score
+#                           plus a margin can't reach alpha
+#   razoring              - with 1 to 3 moves left, if the
+#                           score plus a margin is below
+#                           alpha, only captures are looked
+#                           at, and the node is cut off if
+#                           they don't reach alpha either
+#
+# Two ways of searching with smaller windows are used,
+# each can also be turned off:
+#   principal variation   - after the first move, moves
+#   search                  are only checked to be worse
+#                           than alpha (a zero window), and
+#                           searched again with the full
+#                           window if they aren't
+#   aspiration windows    - each iteration starts with a
+#                           window around the last score,
+#                           made wider if the score falls
+#                           outside it
+#
+# At the end of the search, captures are followed
+# until the position is quiet (quiescence search), so
+# a piece taken back on the next move isn't counted
+# as won.
+#
+# The search goes one move deeper each iteration
+# (iterative deepening) until the depth is reached or
+# the time is up (see timemanager.py). Each iteration
+# fills the table with best moves for the next one.
+
+# Import classes from other files
+from evaluator import Evaluator
+from moveordering import MoveOrdering
+from movepicker import MovePicker, KILLERS, QUIETS, BAD_CAPTURES
+from movegenerator import EN_PASSANT, PROMOTE_KNIGHT, isInCheck, quietMoves
+from bitboard import PAWN, KNIGHT, QUEEN
+from transpositiontable import EXACT, LOWER, UPPER
+
+# Scores for checkmate. A mate found at a lower ply
+# (sooner) scores higher.
+MATE = 100000
+INFINITY = MATE + 1
+
+# Deepest ply the search keeps a principal variation for
+MAX_PLY = 128
+
+# Mate scores above this are counted from the root
+MATE_BOUND = MATE - MAX_PLY
+
+# Positions searched between looks at the clock
+CHECK_NODES = 256
+
+# Null move pruning searches this much less deep (one
+# more when the depth is over NULL_MOVE_DEEP), and is
+# only tried at NULL_MOVE_DEPTH or deeper
+NULL_MOVE_REDUCTION = 2
+NULL_MOVE_DEEP = 6
+NULL_MOVE_DEPTH = 3
+
+# Late move reductions start after this many moves,
+# at LATE_MOVE_DEPTH or deeper. Moves after
+# LATE_MOVE_MORE are reduced by 2 when deep enough.
+LATE_MOVE_START = 3
+LATE_MOVE_DEPTH = 3
+LATE_MOVE_MORE = 6
+
+# Aspiration windows start this far (centipawns) either
+# side of the last score, from ASPIRATION_DEPTH on, and
+# are made ASPIRATION_WIDENING times wider when the score
+# falls outside. Past ASPIRATION_MAX the full window is used.
+ASPIRATION_WINDOW = 50
+ASPIRATION_WIDENING = 2
+ASPIRATION_DEPTH = 4
+ASPIRATION_MAX = 1000
+
+# Captures that can't bring the score within this
+# much of alpha are skipped (delta pruning)
+DELTA_MARGIN = 200
+
+# Changes a mate score found at a ply so it counts
+# from the position instead of the root, as kept in
+# the transposition table.
+#
+# Parameters:
+#   score - int
+#   ply   - int
+# Returns:
+#   score - int
+def scoreToTable(score, ply):
+    if score > MATE_BOUND:
+        return score + ply
+    if score < -MATE_BOUND:
+        return score - ply
+    return score
+
+# Changes a mate score from the transposition table
+# so it counts from the root again.
+#
+# Parameters:
+#   score - int
+#   ply   - int
+# Returns:
+#   score - int
+def scoreFromTable(score, ply):
+    if score > MATE_BOUND:
+        return score - ply
+    if score < -MATE_BOUND:
+        return score + ply
+    return score
+
+class Search:
+    # Constructor for Search.
+    #
+    # Parameters:
+    #   board            - Board
+    #   table            - TranspositionTable
+    #   evaluator        - Evaluator (=None, a new Evaluator)
+    #   quiescenceChecks - Boolean (=False, also try quiet moves that
+    #                      give check at the first quiescence ply)
+    #   nullMove         - Boolean (=True, use null move pruning)
+    #   lateMoveReductions - Boolean (=True, use late move reductions)
+    #   principalVariationSearch - Boolean (=True, search moves after
+    #                      the first with a zero window)
+    #   aspirationWindow - int (=ASPIRATION_WINDOW, centipawns either
+    #                      side of the last score, 0 to not use
+    #                      aspiration windows)
+    #   aspirationWidening - float (=ASPIRATION_WIDENING, how many times
+    #                      wider the window gets when it fails, more
+    #                      than 1)
+    #   futility         - Boolean (=True, use futility pruning)
+    #   razoring         - Boolean (=True, use razoring)
+    def __init__(self, board, table, evaluator=None, quiescenceChecks=False, nullMove=True, \
+                 lateMoveReductions=True, principalVariationSearch=True, \
+                 aspirationWindow=ASPIRATION_WINDOW, aspirationWidening=ASPIRATION_WIDENING, \
+                 futility=True, razoring=True):
+        if evaluator == None:
+            evaluator = Evaluator()
+
+        # A window that doesn't get wider would fail forever
+        if aspirationWidening <= 1:
+            raise ValueError("aspirationWidening must be more than 1: " + str(aspirationWidening))
+
+        self._board = board
+        self._table = table
+        self._evaluator = evaluator
+        self._ordering = MoveOrdering(MAX_PLY)
+        self._quiescenceChecks = quiescenceChecks
+        self._nullMove = nullMove
+        self._lateMoveReductions = lateMoveReductions
+        self._principalVariationSearch = principalVariationSearch
+        self._aspirationWindow = aspirationWindow
+        self._aspirationWidening = aspirationWidening
+        self._futility = futility
+        self._razoring = razoring
+        self.clearStatistics()
+        self._depth = 0
+        self._timeManager = None
+        self._stopEvent = None
+        self._stopped = False
+        self._pv = [[] for i in range(MAX_PLY+1)]
+
+    # Searches the position one move deeper each
+    # iteration, up to a given depth. If the time runs
+    # out, the result of the last iteration that was
+    # finished is returned. The first iteration is
+    # always finished, so there is always a move.
+    #
+    # Parameters:
+    #   depth       - int
+    #   timeManager - TimeManager (=None, no time limit)
+    #   startDepth  - int (=1, depth of the first iteration)
+    #   report      - function (=None, called as report(depth, score, pv)
+    #                 after each finished iteration)
+    # Returns:
+    #   (score, pv) - (int, [int]) (score for the side to move
+    #                 and the principal variation, best move first)
+    def search(self, depth, timeManager=None, startDepth=1, report=None):
+        self.clearStatistics()
+        self._depth = 0
+        self._timeManager = None
+        self._stopped = False
+        score = 0
+        pv = []
+
+        self._ordering.newSearch()
+
+        if timeManager != None:
+            timeManager.start()
+
+        for iteration in range(max(min(startDepth, depth), 1), max(depth, 1)+1):
+            if self._aspirationWindow and iteration >= ASPIRATION_DEPTH:
+                iterationScore = self.aspirationSearch(iteration, score)
+            else:
+                iterationScore = self.negamax(iteration, -INFINITY, INFINITY, 0)
+            if self._stopped:
+                break
+
+            score = iterationScore
+            pv = list(self._pv[0])
+            self._depth = iteration
+            if report != None:
+                report(iteration, score, pv)
+
+            # A forced mate found won't change with more depth
+            if abs(score) > MATE_BOUND:
+                break
+            if timeManager != None:
+                if timeManager.isSoftExpired():
+                    break
+                # Only iterations after the first can be stopped
+                self._timeManager = timeManager
+
+        return score, pv
+
+    # Searches the root with a window around the score
+    # of the last iteration, widening the side the score
+    # falls outside of until it fits.
+    #
+    # Parameters:
+    #   depth         - int
+    #   previousScore - int
+    # Returns:
+    #   score         - int
+    def aspirationSearch(self, depth, previousScore):
+        window = self._aspirationWindow
+        alpha = previousScore - window
+        beta = previousScore + window
+
+        while True:
+            if window > ASPIRATION_MAX:
+                alpha = -INFINITY
+                beta = INFINITY
+
+            score = self.negamax(depth, alpha, beta, 0)
+            if self._stopped or alpha < score < beta:
+                return score
+
+            # Scores are whole centipawns, and the window
+            # grows by at least one
+            window = max(int(window*self._aspirationWidening), window + 1)
+            if score <= alpha:
+                self._aspirationFailLows = self._aspirationFailLows + 1
+                alpha = max(score - window, -INFINITY)
+            else:
+                self._aspirationFailHighs = self._aspirationFailHighs + 1
+                beta = min(score + window, INFINITY)
+
+    # Finds the score of the position with alpha-beta.
+    # Scores at or below alpha, or at or above beta,
+    # are only bounds on the real score.
+    #
+    # Parameters:
+    #   depth    - int
+    #   alpha    - int
+    #   beta     - int
+    #   ply      - int (moves from the root)
+    #   nullMove - Boolean (=True, False right after a null move)
+    # Returns:
+    #   score    - int (for the side to move)
+    def negamax(self, depth, alpha, beta, ply, nullMove=True):
+        board = self._board
+        self._nodes = self._nodes + 1
+        self._pv[ply] = []
+
+        if self.isStopping():
+            return 0
+
+        if depth <= 0:
+            return self.quiescence(alpha, beta, ply, self._quiescenceChecks)
+        if ply >= MAX_PLY:
+            return self._evaluator.evaluate(board)
+
+        positionHash = board.getHash()
+        hashMove = 0
+
+        entry = self._table.probe(positionHash)
+        if entry != None:
+            entryDepth, score, bound, hashMove = entry
+
+            # The root always searches, so a move is found
+            if ply > 0 and entryDepth >= depth:
+                score = scoreFromTable(score, ply)
+                if bound == EXACT or (bound == LOWER and score >= beta) or \
+                   (bound == UPPER and score <= alpha):
+                    if hashMove:
+                        self._pv[ply] = [hashMove]
+                    return score
+
+        side = board.getSideIndex()
+        inCheck = isInCheck(board, side)
+
+        # The pruning below is only done outside the principal
+        # variation (zero window) and away from mate scores
+        staticScore = None
+        if not inCheck and ply > 0 and beta - alpha == 1 and abs(alpha) < MATE_BOUND:
+            staticScore = self._evaluator.evaluate(board)
+
+        # Razoring. Far below alpha, only captures could help
+        if self._razoring and staticScore != None and not hashMove:
+            margin = self._evaluator.getRazorMargin(depth)
+            if margin != None and staticScore + margin < alpha:
+                score = self.quiescence(alpha, alpha+1, ply, False)
+                if self._stopped:
+                    return 0
+                if score <= alpha:
+                    self._razorCutoffs = self._razorCutoffs + 1
+                    return score
+
+        # Null move pruning. Not in check, not twice in a row,
+        # and only with a piece besides Pawns, since with only
+        # Pawns passing may be better than any move (zugzwang)
+        if self._nullMove and nullMove and ply > 0 and not inCheck and \
+           depth >= NULL_MOVE_DEPTH and abs(beta) < MATE_BOUND and \
+           self.hasPieces(side) and (staticScore if staticScore != None else \
+                                     self._evaluator.evaluate(board)) >= beta:
+            reduction = NULL_MOVE_REDUCTION
+            if depth > NULL_MOVE_DEEP:
+                reduction = reduction + 1
+
+            undo = board.makeNullMove()
+            score = -self.negamax(depth-1-reduction, -beta, -beta+1, ply+1, False)
+            board.unmakeNullMove(undo)
+
+            if self._stopped:
+                return 0
+            if score >= beta:
+                self._nullMoveCutoffs = self._nullMoveCutoffs + 1
+                return beta
+
+        # Futility pruning. If even a margin above the score
+        # doesn't reach alpha, quiet moves are skipped
+        futilityScore = None
+        if self._futility and staticScore != None:
+            margin = self._evaluator.getFutilityMargin(depth)
+            if margin != None and staticScore + margin <= alpha:
+                futilityScore = staticScore + margin
+
+        picker = MovePicker(board, self._ordering, hashMove, ply)
+
+        alphaStart = alpha
+        bestScore = -INFINITY
+        bestMove = 0
+        legalMoves = 0
+
+        for move in picker.moves():
+            undo = board.makeMove(move)
+
+            # The moves are pseudo-legal
+            if isInCheck(board, side):
+                board.unmakeMove(undo)
+                continue
+            legalMoves = legalMoves + 1
+
+            # Quiet moves that don't give check are skipped
+            # after the first move when the node is futile
+            if futilityScore != None and legalMoves > 1 and picker.getStage() >= KILLERS and \
+               picker.getStage() != BAD_CAPTURES and not isInCheck(board, 1 - side):
+                board.unmakeMove(undo)
+                self._futilityPrunes = self._futilityPrunes + 1
+                if futilityScore > bestScore:
+                    bestScore = futilityScore
+                continue
+
+            # Late quiet moves are searched less deep first,
+            # unless they give check or the side is in check
+            reduction = 0
+            if self._lateMoveReductions and legalMoves > LATE_MOVE_START and \
+               depth >= LATE_MOVE_DEPTH and not inCheck and picker.getStage() == QUIETS and \
+               not isInCheck(board, 1 - side):
+                reduction = 1
+                if legalMoves > LATE_MOVE_MORE and depth > LATE_MOVE_DEPTH:
+                    reduction = 2
+                self._reductions = self._reductions + 1
+
+            if legalMoves == 1:
+                score = -self.negamax(depth-1, -beta, -alpha, ply+1)
+            elif reduction or self._principalVariationSearch:
+                # Only checks the move is no better than alpha
+                score = -self.negamax(depth-1-reduction, -alpha-1, -alpha, ply+1)
+
+                if reduction and score > alpha and not self._stopped:
+                    self._reSearches = self._reSearches + 1
+                    if self._principalVariationSearch:
+                        score = -self.negamax(depth-1, -alpha-1, -alpha, ply+1)
+                    else:
+                        score = -self.negamax(depth-1, -beta, -alpha, ply+1)
+
+                # Better than alpha, so its real score is needed
+                if self._principalVariationSearch and alpha < score < beta and \
+                   not self._stopped:
+                    self._pvsReSearches = self._pvsReSearches + 1
+                    score = -self.negamax(depth-1, -beta, -alpha, ply+1)
+            else:
+                score = -self.negamax(depth-1, -beta, -alpha, ply+1)
+            board.unmakeMove(undo)
+
+            # A stopped search's scores mean nothing
+            if self._stopped:
+                return 0
+
+            if score > bestScore:
+                bestScore = score
+                bestMove = move
+
+                if score > alpha:
+                    alpha = score
+                    self._pv[ply] = [move] + self._pv[ply+1]
+
+                    if alpha >= beta:
+                        self._ordering.countCutoff(legalMoves == 1, picker.getStage())
+                        if not self._ordering.isCapture(board, move):
+                            self._ordering.addCutoff(move, side, depth, ply)
+                        break
+
+        # No legal moves is checkmate or stalemate
+        if not legalMoves:
+            if inCheck:
+                return -MATE + ply
+            return 0
+
+        if bestScore >= beta:
+            bound = LOWER
+        elif bestScore > alphaStart:
+            bound = EXACT
+        else:
+            bound = UPPER
+        self._table.store(positionHash, depth, scoreToTable(bestScore, ply), bound, bestMove)
+
+        return bestScore
+
+    # Follows captures (and promotions) from a position
+    # until it is quiet. The side to move can also
+    # choose not to take anything (stand pat), so the
+    # score is at least the evaluation. In check, every
+    # move is tried instead.
+    #
+    # Parameters:
+    #   alpha  - int
+    #   beta   - int
+    #   ply    - int (moves from the root)
+    #   checks - Boolean (also try quiet moves that give check)
+    # Returns:
+    #   score  - int (for the side to move)
+    def quiescence(self, alpha, beta, ply, checks):
+        board = self._board
+        self._nodes = self._nodes + 1
+        self._quiescenceNodes = self._quiescenceNodes + 1
+        self._pv[ply] = []
+
+        if self.isStopping():
+            return 0
+        if ply >= MAX_PLY:
+            return self._evaluator.evaluate(board)
+
+        side = board.getSideIndex()
+
+        # The evaluation finds the attack maps anyway, so
+        # they are found first and used for check and for
+        # which captures are defended
+        attackMaps = None
+        if self._evaluator.hasAttackTerms():
+            attackMaps = self._evaluator.getAttackMaps(board)
+            inCheck = attackMaps.isInCheck(side)
+        else:
+            inCheck = isInCheck(board, side)
+
+        if inCheck:
+            standPat = -INFINITY
+            picker = MovePicker(board, self._ordering, 0, ply)
+            moves = picker.moves()
+        else:
+            standPat = self._evaluator.evaluate(board)
+            if standPat >= beta:
+                return standPat
+
+            # Not even taking a Queen would reach alpha
+            if standPat + self._evaluator.getPieceValue(QUEEN) + DELTA_MARGIN < alpha:
+                self._deltaPrunes = self._deltaPrunes + 1
+                return standPat
+
+            if standPat > alpha:
+                alpha = standPat
+
+            picker = MovePicker(board, self._ordering, 0, ply, True, attackMaps)
+            moves = picker.moves()
+            if checks:
+                moves = self.withQuietMoves(moves)
+
+        squares = board.getSquares()
+        bestScore = standPat
+        legalMoves = 0
+
+        for move in moves:
+            flags = move >> 12
+            taken = squares[(move >> 6) & 63]
+            capture = taken != None or flags == EN_PASSANT or flags >= PROMOTE_KNIGHT
+
+            if not inCheck and capture:
+                # Captures that look like they lose material
+                # aren't followed
+                if picker.getStage() == BAD_CAPTURES:
+                    continue
+
+                # Nor are ones that can't bring the score near alpha
+                if flags < PROMOTE_KNIGHT:
+                    if taken == None:
+                        value = self._evaluator.getPieceValue(PAWN)
+                    else:
+                        value = self._evaluator.getPieceValue(taken%6)
+                    if standPat + value + DELTA_MARGIN <= alpha:
+                        self._deltaPrunes = self._deltaPrunes + 1
+                        continue
+
+            undo = board.makeMove(move)
+            if isInCheck(board, side):
+                board.unmakeMove(undo)
+                continue
+
+            # Quiet moves are only followed if they give check
+            if not inCheck and not capture and not isInCheck(board, 1 - side):
+                board.unmakeMove(undo)
+                continue
+            legalMoves = legalMoves + 1
+
+            score = -self.quiescence(-beta, -alpha, ply+1, False)
+            board.unmakeMove(undo)
+
+            if self._stopped:
+                return 0
+
+            if score > bestScore:
+                bestScore = score
+
+                if score > alpha:
+                    alpha = score
+                    self._pv[ply] = [move] + self._pv[ply+1]
+
+                    if alpha >= beta:
+                        break
+
+        # In check with no legal moves is checkmate
+        if inCheck and not legalMoves:
+            return -MATE + ply
+
+        return bestScore
+
+    # Finds if a side has a piece besides its Pawns
+    # and King.
+    #
+    # Parameters:
+    #   side   - int (WHITE or BLACK)
+    # Returns:
+    #   pieces - Boolean
+    def hasPieces(self, side):
+        pieces = self._board.getPieceBitboards()
+
+        for piece in range(KNIGHT, QUEEN+1):
+            if pieces[6*side + piece]:
+                return True
+        return False
+
+    # Goes through some moves, then the quiet moves of
+    # the position (see movegenerator.quietMoves).
+    #
+    # Parameters:
+    #   moves - int (generator)
+    # Returns:
+    #   move  - int (generator)
+    def withQuietMoves(self, moves):
+        yield from moves
+        yield from quietMoves(self._board)
+
+    # Finds if the search has to stop, looking at the
+    # clock (and the stop event) every CHECK_NODES
+    # positions.
+    #
+    # Returns:
+    #   stopping - Boolean
+    def isStopping(self):
+        if self._nodes % CHECK_NODES == 0:
+            if self._timeManager != None and self._timeManager.isHardExpired():
+                self._stopped = True
+            if self._stopEvent != None and self._stopEvent.is_set():
+                self._stopped = True
+
+        return self._stopped
+
+    # Sets an event another process can set to stop the
+    # search (see smp.py). Unlike the time limit, it can
+    # stop the first iteration too.
+    #
+    # Parameters:
+    #   stopEvent - multiprocessing.Event (None for none)
+    def setStopEvent(self, stopEvent):
+        self._stopEvent = stopEvent
+
+    # Returns what the last search did: positions
+    # searched (nodes), how many of those were in the
+    # quiescence search, captures skipped by delta
+    # pruning, cutoffs from null moves, moves searched
+    # with late move reductions and how many of those
+    # were searched again at full depth, zero window
+    # searches done again with the full window,
+    # aspiration windows the score fell below or above,
+    # quiet moves skipped by futility pruning and nodes
+    # cut off by razoring.
+    #
+    # Returns:
+    #   statistics - {}
+    def getStatistics(self):
+        return {"nodes": self._nodes, "quiescenceNodes": self._quiescenceNodes, \
+                "deltaPrunes": self._deltaPrunes, "nullMoveCutoffs": self._nullMoveCutoffs, \
+                "reductions": self._reductions, "reSearches": self._reSearches, \
+                "pvsReSearches": self._pvsReSearches, \
+                "aspirationFailLows": self._aspirationFailLows, \
+                "aspirationFailHighs": self._aspirationFailHighs, \
+                "futilityPrunes": self._futilityPrunes, "razorCutoffs": self._razorCutoffs}
+
+    # Resets what getStatistics returns.
+    def clearStatistics(self):
+        self._nodes = 0
+        self._quiescenceNodes = 0
+        self._deltaPrunes = 0
+        self._nullMoveCutoffs = 0
+        self._reductions = 0
+        self._reSearches = 0
+        self._pvsReSearches = 0
+        self._aspirationFailLows = 0
+        self._aspirationFailHighs = 0
+        self._futilityPrunes = 0
+        self._razorCutoffs = 0
+
+    # Returns the depth of the last iteration the last
+    # search finished.
+    #
+    # Returns:
+    #   depth - int
+    def getDepth(self):
+        return self._depth
+
+    # Returns how well the moves have been ordered
+    # (see moveordering.py).
+    #
+    # Returns:
+    #   statistics - {}
+    def getOrderingStatistics(self):
+        return self._ordering.getStatistics()
+
+    # Returns how often the evaluator found the Pawn
+    # score in its PawnTable (see pawnstructure.py).
+    #
+    # Returns:
+    #   statistics - {}
+    def getPawnTableStatistics(self):
+        return self._evaluator.getPawnTableStatistics()
+
+    # Returns the number of positions searched by
+    # the last search.
+    #
+    # Returns:
+    #   nodes - int
+    def getNodes(self):
+        return self._nodes
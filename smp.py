@@ -0,0 +1,177 @@
+## DeepYellowJ - Version 0.1 (c) 2016 Ahmad Nazeri
+#    LazySMP - smp.py
+#
+# This file lets DeepYellowJ search with several
+# processes (Lazy SMP). Python threads can't search
+# at the same time, so helper processes are used.
+# Every process searches the same position, and
+# they share one transposition table in shared
+# memory (see transpositiontable.py), so each one
+# uses what the others have found.
+#
+# The helpers start at different depths (staggered)
+# and some go one deeper, so they don't all search
+# the same thing. Each helper reports every iteration
+# it finishes. When the main search is done, the
+# helpers are stopped and the deepest finished result
+# is used.
+
+# Import classes from other files
+from board import Board
+from search import Search, MAX_PLY
+from transpositiontable import TranspositionTable
+
+# Import what is needed to run the helpers
+import multiprocessing
+import queue
+import time
+
+# Helper i starts at depth 1 + i%STAGGER
+STAGGER = 3
+
+# Seconds to wait for a result before checking that
+# the helpers are still running
+RESULT_TIMEOUT = 0.1
+
+# Most seconds to wait for the helpers to stop, after
+# that the results found so far are used
+STOP_TIMEOUT = 5.0
+
+# Runs in a helper process: searches each position
+# sent to it until told to stop. A job of None ends
+# the helper.
+#
+# Parameters:
+#   helper     - int (number of the helper, from 1)
+#   sharedName - String (name of the shared table)
+#   sizeMB     - int
+#   options    - {} (keyword options for Search)
+#   jobs       - multiprocessing.Queue
+#   results    - multiprocessing.Queue
+#   stopEvent  - multiprocessing.Event
+def helperProcess(helper, sharedName, sizeMB, options, jobs, results, stopEvent):
+    board = Board()
+    table = TranspositionTable(sizeMB, sharedName=sharedName)
+    search = Search(board, table, **options)
+    search.setStopEvent(stopEvent)
+
+    while True:
+        job = jobs.get()
+        if job == None:
+            break
+
+        searchNumber, fen, depth = job
+        board.loadFen(fen)
+
+        # Reports each finished iteration to the main process
+        def report(iterationDepth, score, pv):
+            results.put((searchNumber, helper, iterationDepth, score, pv))
+
+        search.search(min(depth + helper%2, MAX_PLY), None, 1 + helper%STAGGER, report)
+
+        # Tells the main process this helper has stopped
+        results.put((searchNumber, helper, None, None, None))
+
+    table.close()
+
+class LazySMP:
+    # Constructor for LazySMP. Starts the helper
+    # processes.
+    #
+    # Parameters:
+    #   search    - Search (the main search, using table)
+    #   table     - TranspositionTable (made with shared=True)
+    #   sizeMB    - int (size the table was made with)
+    #   processes - int (processes in all, counting this one)
+    #   options   - {} (=None, keyword options for Search)
+    def __init__(self, search, table, sizeMB, processes, options=None):
+        if options == None:
+            options = {}
+
+        self._search = search
+        self._searchNumber = 0
+        self._depth = 0
+        self._stopEvent = multiprocessing.Event()
+        self._results = multiprocessing.Queue()
+        self._jobs = []
+        self._helpers = []
+
+        for helper in range(1, processes):
+            jobs = multiprocessing.Queue()
+            process = multiprocessing.Process(target=helperProcess, \
+                                              args=(helper, table.getSharedName(), sizeMB, options, \
+                                                    jobs, self._results, self._stopEvent), \
+                                              daemon=True)
+            process.start()
+            self._jobs.append(jobs)
+            self._helpers.append(process)
+
+    # Searches a position with every process.
+    #
+    # Parameters:
+    #   board       - Board
+    #   depth       - int
+    #   timeManager - TimeManager (=None, no time limit)
+    # Returns:
+    #   (score, pv) - (int, [int])
+    def search(self, board, depth, timeManager=None):
+        self._searchNumber = self._searchNumber + 1
+        self._stopEvent.clear()
+
+        fen = board.getFen()
+        for jobs in self._jobs:
+            jobs.put((self._searchNumber, fen, depth))
+
+        score, pv = self._search.search(depth, timeManager)
+        bestDepth = self._search.getDepth()
+
+        # Stops the helpers and waits for them, keeping
+        # any result deeper than the main search's. A
+        # helper that has died or doesn't stop isn't
+        # waited for, the main search's result is enough.
+        self._stopEvent.set()
+        running = set(range(1, len(self._helpers) + 1))
+        stopTime = time.time() + STOP_TIMEOUT
+        while running:
+            try:
+                result = self._results.get(timeout=RESULT_TIMEOUT)
+            except queue.Empty:
+                running = set(helper for helper in running if self._helpers[helper-1].is_alive())
+                if time.time() > stopTime:
+                    break
+                continue
+
+            searchNumber, helper, helperDepth, helperScore, helperPV = result
+            if searchNumber != self._searchNumber:
+                continue
+            if helperDepth == None:
+                running.discard(helper)
+            elif helperDepth > bestDepth and helperPV:
+                bestDepth = helperDepth
+                score = helperScore
+                pv = helperPV
+
+        self._depth = bestDepth
+        return score, pv
+
+    # Returns the depth of the result of the last search.
+    #
+    # Returns:
+    #   depth - int
+    def getDepth(self):
+        return self._depth
+
+    # Ends the helper processes. A helper that doesn't
+    # end in time is stopped.
+    def close(self):
+        self._stopEvent.set()
+        for jobs in self._jobs:
+            jobs.put(None)
+        for process in self._helpers:
+            process.join(STOP_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+        self._jobs = []
+        self._helpers = []
@@ -0,0 +1,23 @@
+## DeepYellowJ - Version 0.1 (c) 2016 Ahmad Nazeri
+#    Squares - squares.py
+#
+# This file holds the lookup tables used to go
+# between a square's name ("E4") and its index
+# (0-63, A1 is 0, B1 is 1, ..., H8 is 63).
+# Names are only used when reading or printing
+# moves, everything else works on the index.
+
+# Board Size
+SIZE = 8
+
+COLUMNS = ["A", "B", "C", "D", "E", "F", "G", "H"]
+
+# Name of each square, by index
+SQUARE_NAMES = [COLUMNS[i%SIZE]+str(i//SIZE+1) for i in range(SIZE*SIZE)]
+
+# Index of each square, by name
+SQUARE_INDEX = dict((SQUARE_NAMES[i], i) for i in range(SIZE*SIZE))
+
+# Row and column of each square, by index. Row 0
+# is the top of the drawn board (the 8th rank).
+ROWS_AND_COLUMNS = [(SIZE-1 - i//SIZE, i%SIZE) for i in range(SIZE*SIZE)]
@@ -0,0 +1,70 @@
+## DeepYellowJ - Version 0.1 (c) 2016 Ahmad Nazeri
+#    TimeManager - timemanager.py
+#
+# This file decides how long DeepYellowJ may think
+# about a move. There are two deadlines:
+#   soft - no new search iteration is started after it
+#   hard - the search stops right away
+# They come from a fixed time for each move, or from
+# the time left on the clock and the increment.
+
+# Import the clock used to time the search
+from time import perf_counter
+
+# Moves the time left on the clock is shared between
+MOVES_TO_GO = 30
+
+# How much longer than the soft deadline the hard
+# deadline is when playing on a clock
+HARD_FACTOR = 4
+
+# Seconds kept back so the clock never runs out
+SAFETY_MARGIN = 0.05
+
+class TimeManager:
+    # Constructor for TimeManager. With neither a move
+    # time nor a clock there are no deadlines.
+    #
+    # Parameters:
+    #   moveTime  - float (=None, seconds for every move)
+    #   timeLeft  - float (=None, seconds left on the clock)
+    #   increment - float (=0, seconds added after each move)
+    def __init__(self, moveTime=None, timeLeft=None, increment=0):
+        self._moveTime = moveTime
+        self._timeLeft = timeLeft
+        self._increment = increment
+        self._start = perf_counter()
+        self._soft = None
+        self._hard = None
+
+    # Starts timing a move and sets the deadlines
+    # (seconds after the start).
+    def start(self):
+        self._start = perf_counter()
+        self._soft = None
+        self._hard = None
+
+        if self._timeLeft != None:
+            available = max(self._timeLeft - SAFETY_MARGIN, 0)
+            self._soft = min(available/MOVES_TO_GO + self._increment, available)
+            self._hard = min(HARD_FACTOR*self._soft, available)
+
+        # A fixed move time is spent in full
+        if self._moveTime != None:
+            if self._hard == None or self._moveTime < self._hard:
+                self._soft = self._moveTime
+                self._hard = self._moveTime
+
+    # Finds if a new iteration should not be started.
+    #
+    # Returns:
+    #   expired - Boolean
+    def isSoftExpired(self):
+        return self._soft != None and perf_counter() - self._start >= self._soft
+
+    # Finds if the search has to stop now.
+    #
+    # Returns:
+    #   expired - Boolean
+    def isHardExpired(self):
+        return self._hard != None and perf_counter() - self._start >= self._hard
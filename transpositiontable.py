@@ -0,0 +1,196 @@
+## DeepYellowJ - Version 0.1 (c) 2016 Ahmad Nazeri
+#    TranspositionTable - transpositiontable.py
+#
+# This file is the transposition table used by
+# DeepYellowJ to remember positions it has already
+# scored. It is a fixed size array of 64-bit
+# numbers made when the table is created, so it
+# never grows.
+#
+# The table is split into buckets of two entries.
+# The first entry keeps the deepest result seen
+# (depth-preferred), the second is always replaced.
+# Each entry is two numbers: the position's hash
+# xor the data, and the packed data:
+#   bits  0-15 - best move (0 if none)
+#   bits 16-47 - score + SCORE_OFFSET
+#   bits 48-55 - depth
+#   bits 56-57 - bound (0 means the entry is empty)
+#
+# The table can be put in shared memory so several
+# processes search with it (see smp.py). They write
+# without locks, so an entry could be half written by
+# two processes. Keeping hash xor data means such an
+# entry no longer matches the hash and is ignored.
+
+# Import classes from other files
+from bitboard import tableEntries
+
+# Import the array used to hold the table
+from array import array
+from multiprocessing import shared_memory
+
+# Bound types
+EXACT = 1
+LOWER = 2 # score is at least this (failed high)
+UPPER = 3 # score is at most this (failed low)
+
+# Used to store negative scores
+SCORE_OFFSET = 1 << 31
+
+# Numbers in each bucket (2 entries of key and data)
+BUCKET_SIZE = 4
+
+# Bytes in each bucket
+BUCKET_BYTES = 8*BUCKET_SIZE
+
+class TranspositionTable:
+    # Constructor for TranspositionTable. With shared
+    # True the table is made in shared memory, and
+    # other processes use it by passing its name (see
+    # getSharedName) as sharedName.
+    #
+    # Parameters:
+    #   sizeMB     - int (megabytes to use)
+    #   shared     - Boolean (=False, make the table in shared memory)
+    #   sharedName - String (=None, use this shared table)
+    def __init__(self, sizeMB, shared=False, sharedName=None):
+        # Use the largest power of two buckets that fits,
+        # so the bucket can be found with a mask
+        buckets = tableEntries(sizeMB*1024*1024, BUCKET_BYTES)
+
+        self._mask = buckets - 1
+        self._memory = None
+        self._owner = False
+
+        if sharedName != None:
+            self._memory = shared_memory.SharedMemory(name=sharedName)
+        elif shared:
+            self._memory = shared_memory.SharedMemory(create=True, size=buckets*BUCKET_BYTES)
+            self._owner = True
+
+        if self._memory != None:
+            self._table = self._memory.buf[:buckets*BUCKET_BYTES].cast("Q")
+        else:
+            self._table = array("Q", [0]) * (buckets*BUCKET_SIZE)
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._overwrites = 0
+
+    # Looks up a position.
+    #
+    # Parameters:
+    #   positionHash - int
+    # Returns:
+    #   (depth, score, bound, move) or None if not found
+    def probe(self, positionHash):
+        table = self._table
+        index = (positionHash & self._mask)*BUCKET_SIZE
+
+        for slot in (index, index+2):
+            data = table[slot+1]
+            if data and table[slot] ^ data == positionHash:
+                self._hits = self._hits + 1
+                return self.unpack(data)
+
+        self._misses = self._misses + 1
+        return None
+
+    # Stores the result for a position. The deep
+    # entry is used if the position is already there
+    # or the result is at least as deep, otherwise the
+    # always-replace entry is used.
+    #
+    # Parameters:
+    #   positionHash - int
+    #   depth        - int
+    #   score        - int
+    #   bound        - int
+    #   move         - int (=0)
+    def store(self, positionHash, depth, score, bound, move=0):
+        table = self._table
+        index = (positionHash & self._mask)*BUCKET_SIZE
+        data = move | (score + SCORE_OFFSET) << 16 | depth << 48 | bound << 56
+
+        deepData = table[index+1]
+        deepKey = table[index] ^ deepData
+
+        if not deepData or deepKey == positionHash or depth >= (deepData >> 48) & 0xFF:
+            if deepKey == positionHash:
+                # Keeps a move already found for this position
+                if not move:
+                    data = data | (deepData & 0xFFFF)
+            elif deepData:
+                # The old deep entry moves to the always-replace entry
+                if table[index+3] and table[index+2] ^ table[index+3] != positionHash:
+                    self._overwrites = self._overwrites + 1
+                table[index+2] = deepKey ^ deepData
+                table[index+3] = deepData
+            slot = index
+        else:
+            slot = index+2
+            if table[slot+1] and table[slot] ^ table[slot+1] != positionHash:
+                self._overwrites = self._overwrites + 1
+
+        table[slot] = positionHash ^ data
+        table[slot+1] = data
+        self._stores = self._stores + 1
+
+    # Unpacks the data of an entry.
+    #
+    # Parameters:
+    #   data - int
+    # Returns:
+    #   (depth, score, bound, move) - (int, int, int, int)
+    def unpack(self, data):
+        return (data >> 48) & 0xFF, ((data >> 16) & 0xFFFFFFFF) - SCORE_OFFSET, \
+               data >> 56, data & 0xFFFF
+
+    # Empties the table and resets the statistics.
+    def clear(self):
+        if self._memory != None:
+            self._table[:] = array("Q", [0]) * len(self._table)
+        else:
+            self._table = array("Q", [0]) * len(self._table)
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._overwrites = 0
+
+    # Returns the name other processes use to share
+    # the table (None if it isn't in shared memory).
+    #
+    # Returns:
+    #   name - String
+    def getSharedName(self):
+        if self._memory == None:
+            return None
+        return self._memory.name
+
+    # Stops using shared memory. The process that made
+    # the table also frees it. The table can't be used
+    # after this.
+    def close(self):
+        if self._memory == None:
+            return
+
+        self._table.release()
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+        self._memory = None
+
+    # Returns how the table has been used.
+    #
+    # Returns:
+    #   statistics - {}
+    def getStatistics(self):
+        probes = self._hits + self._misses
+        if probes:
+            hitRate = self._hits/probes
+        else:
+            hitRate = 0.0
+
+        return {"hits": self._hits, "misses": self._misses, "hitRate": hitRate, \
+                "stores": self._stores, "overwrites": self._overwrites}
@@ -0,0 +1,34 @@
+## DeepYellowJ - Version 0.1 (c) 2016 Ahmad Nazeri
+#    Zobrist - zobrist.py
+#
+# This file holds the random keys used for the
+# Zobrist hash of a position. The hash is the xor
+# of the key of every piece on its square, plus
+# the keys for the side to move, the castling
+# rights and the en passant column. Making a move
+# only xors in/out the keys that change.
+
+# The magic number generator always gives the same
+# numbers, so a hash stays the same between runs
+from magic import MagicRandom
+
+# Board Size
+SIZE = 8
+
+# Seed for the keys. Changing it changes every hash.
+SEED = 20160513
+
+random = MagicRandom(SEED)
+
+# PIECE_KEYS[piece][square], piece in bitboard order
+PIECE_KEYS = [[random.random() for square in range(SIZE*SIZE)] for piece in range(2*6)]
+
+# Xored in when it is black's move
+SIDE_KEY = random.random()
+
+# CASTLING_KEYS[castling], one for each set of rights.
+# Having no rights left xors in nothing.
+CASTLING_KEYS = [0] + [random.random() for castling in range(1, 16)]
+
+# EN_PASSANT_KEYS[column] of the en passant square
+EN_PASSANT_KEYS = [random.random() for column in range(SIZE)]